@@ -26,11 +26,16 @@ config.set_main_option("sqlalchemy.url", sync_db_url)
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# search_vector columns and their GIN indexes are created by app/db/search.py, not mapped on the models
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name is not None and "search_vector" in name)
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -45,7 +50,7 @@ def run_migrations_online() -> None:
     )
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
         with context.begin_transaction():
             context.run_migrations()
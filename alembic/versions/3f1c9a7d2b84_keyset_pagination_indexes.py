@@ -0,0 +1,32 @@
+"""Keyset pagination indexes
+
+Revision ID: 3f1c9a7d2b84
+Revises: ee61ec691203
+Create Date: 2026-10-18 09:12:41.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b84'
+down_revision: Union[str, Sequence[str], None] = 'ee61ec691203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_projects_owner_id_created_at_id', 'projects', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_task_comments_task_id_created_at_id', 'task_comments', ['task_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_comments_task_id_created_at_id', table_name='task_comments')
+    op.drop_index('ix_projects_owner_id_created_at_id', table_name='projects')
+    op.drop_index('ix_tasks_project_id_created_at_id', table_name='tasks')
@@ -0,0 +1,38 @@
+"""Task filter indexes
+
+Revision ID: 7b2e4d91c0a6
+Revises: 3f1c9a7d2b84
+Create Date: 2026-10-18 10:03:17.204611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4d91c0a6'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_tasks_project_id_due_date', 'tasks', ['project_id', 'due_date'], unique=False,
+        postgresql_where=sa.text('due_date IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_tasks_assigned_to', 'tasks', ['assigned_to'], unique=False,
+        postgresql_where=sa.text('assigned_to IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assigned_to', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
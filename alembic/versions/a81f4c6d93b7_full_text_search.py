@@ -0,0 +1,40 @@
+"""Full-text search
+
+Revision ID: a81f4c6d93b7
+Revises: c5d83e0f1a29
+Create Date: 2026-10-18 15:02:37.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81f4c6d93b7'
+down_revision: Union[str, Sequence[str], None] = 'c5d83e0f1a29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TASK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+COMMENT_SEARCH_VECTOR = "to_tsvector('english', coalesce(comment_text, ''))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated columns are computed in the INSERT itself; fastupdate lets GIN defer posting-list
+    # maintenance to the pending list so writes don't pay for a full index update.
+    for table, expression in (('tasks', TASK_SEARCH_VECTOR), ('task_comments', COMMENT_SEARCH_VECTOR)):
+        op.execute(f'ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({expression}) STORED')
+        op.execute(f'CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector) WITH (fastupdate = on)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('task_comments', 'tasks'):
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_vector')
+        op.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,133 @@
+"""Project summaries
+
+Revision ID: c5d83e0f1a29
+Revises: 7b2e4d91c0a6
+Create Date: 2026-10-18 13:41:05.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d83e0f1a29'
+down_revision: Union[str, Sequence[str], None] = '7b2e4d91c0a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TASK_COUNTS = {
+    'todo_count': "status = 'todo'",
+    'in_progress_count': "status = 'in_progress'",
+    'done_count': "status = 'done'",
+    'low_count': "priority = 'low'",
+    'medium_count': "priority = 'medium'",
+    'high_count': "priority = 'high'",
+}
+
+
+def _task_delta_upsert(source: str) -> str:
+    # `source` yields (project_id, status, priority, sign) rows from the statement's transition tables.
+    columns = ', '.join(TASK_COUNTS)
+    sums = ', '.join(f'COALESCE(SUM(sign) FILTER (WHERE {cond}), 0)' for cond in TASK_COUNTS.values())
+    changed = ' OR '.join(f'COALESCE(SUM(sign) FILTER (WHERE {cond}), 0) <> 0' for cond in TASK_COUNTS.values())
+    updates = ', '.join(f'{col} = s.{col} + EXCLUDED.{col}' for col in TASK_COUNTS)
+    return f"""
+        INSERT INTO project_summaries AS s (project_id, {columns}, updated_at)
+        SELECT project_id, {sums}, now()
+        FROM ({source}) AS delta
+        GROUP BY project_id
+        HAVING {changed}
+        ON CONFLICT (project_id) DO UPDATE SET {updates}, updated_at = now();
+    """
+
+
+def _comment_delta_upsert(source: str, sign: int) -> str:
+    return f"""
+        INSERT INTO project_summaries AS s (project_id, comment_count, updated_at)
+        SELECT t.project_id, {sign} * COUNT(*), now()
+        FROM {source} AS c JOIN tasks AS t ON t.id = c.task_id
+        GROUP BY t.project_id
+        ON CONFLICT (project_id) DO UPDATE SET comment_count = s.comment_count + EXCLUDED.comment_count, updated_at = now();
+    """
+
+
+def _function(name: str, body: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            {body}
+            RETURN NULL;
+        END;
+        $$;
+    """
+
+
+TRIGGERS = [
+    ('project_summary_tasks_inserted', 'tasks', 'INSERT', 'NEW TABLE AS new_rows',
+     _task_delta_upsert('SELECT project_id, status::text AS status, priority::text AS priority, 1 AS sign FROM new_rows')),
+    ('project_summary_tasks_updated', 'tasks', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+     _task_delta_upsert(
+         'SELECT project_id, status::text AS status, priority::text AS priority, 1 AS sign FROM new_rows '
+         'UNION ALL SELECT project_id, status::text, priority::text, -1 FROM old_rows'
+     )),
+    ('project_summary_tasks_deleted', 'tasks', 'DELETE', 'OLD TABLE AS old_rows',
+     _task_delta_upsert('SELECT project_id, status::text AS status, priority::text AS priority, -1 AS sign FROM old_rows')),
+    ('project_summary_comments_inserted', 'task_comments', 'INSERT', 'NEW TABLE AS new_rows',
+     _comment_delta_upsert('new_rows', 1)),
+    ('project_summary_comments_deleted', 'task_comments', 'DELETE', 'OLD TABLE AS old_rows',
+     _comment_delta_upsert('old_rows', -1)),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_summaries',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('todo_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('in_progress_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('done_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('low_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('medium_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('high_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    # Open (not done) tasks with a due date, for the overdue count.
+    op.create_index(
+        'ix_tasks_project_id_open_due_date', 'tasks', ['project_id', 'due_date'], unique=False,
+        postgresql_where=sa.text("due_date IS NOT NULL AND status <> 'done'"),
+    )
+
+    for name, table, event, referencing, body in TRIGGERS:
+        op.execute(_function(name, body))
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {event} ON {table} '
+            f'REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION {name}()'
+        )
+
+    columns = ', '.join(TASK_COUNTS)
+    counts = ', '.join(f'COUNT(*) FILTER (WHERE {cond}) AS {col}' for col, cond in TASK_COUNTS.items())
+    totals = ', '.join(f'COALESCE(t.{col}, 0)' for col in TASK_COUNTS)
+    op.execute(f"""
+        INSERT INTO project_summaries (project_id, {columns}, comment_count, updated_at)
+        SELECT p.id, {totals}, COALESCE(c.comment_count, 0), now()
+        FROM projects AS p
+        LEFT JOIN (SELECT project_id, {counts} FROM tasks GROUP BY project_id) AS t ON t.project_id = p.id
+        LEFT JOIN (SELECT tk.project_id, COUNT(*) AS comment_count
+                   FROM task_comments AS tc JOIN tasks AS tk ON tk.id = tc.task_id
+                   GROUP BY tk.project_id) AS c ON c.project_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _, _ in reversed(TRIGGERS):
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON {table}')
+        op.execute(f'DROP FUNCTION IF EXISTS {name}()')
+    op.drop_index('ix_tasks_project_id_open_due_date', table_name='tasks')
+    op.drop_table('project_summaries')
@@ -0,0 +1,90 @@
+"""Change tracking for sync
+
+Revision ID: e3b90f5c2d17
+Revises: a81f4c6d93b7
+Create Date: 2026-10-18 19:32:10.406153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b90f5c2d17'
+down_revision: Union[str, Sequence[str], None] = 'a81f4c6d93b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRACKED_TABLES = ('projects', 'tasks', 'task_comments')
+
+TOMBSTONE_VALUES = {
+    'projects': "'project', old.id, old.id, old.owner_id",
+    'tasks': "'task', old.id, old.project_id, old.assigned_to",
+    'task_comments': "'comment', old.id, (SELECT project_id FROM tasks WHERE tasks.id = old.task_id), NULL",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_change_seq', 'tombstones', ['change_seq'], unique=False)
+    # Existing rows keep change_seq 0: they are below every sync token, so clients get them from the
+    # initial (token-less) sync and adding the column doesn't rewrite the tables.
+    for table in TRACKED_TABLES:
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index(f'ix_{table}_change_seq', table, ['change_seq'], unique=False)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_change_seq() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_seq := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$
+    """)
+    for table in TRACKED_TABLES + ('tombstones',):
+        op.execute(
+            f'CREATE TRIGGER {table}_change_seq BEFORE INSERT OR UPDATE ON {table} '
+            'FOR EACH ROW EXECUTE FUNCTION set_change_seq()'
+        )
+    for table, values in TOMBSTONE_VALUES.items():
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_tombstone() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO tombstones (kind, entity_id, project_id, user_id, deleted_at)
+                SELECT {values}, now() FROM old_rows AS old;
+                RETURN NULL;
+            END;
+            $$
+        """)
+        op.execute(
+            f'CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table} '
+            f'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {table}_tombstone()'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TOMBSTONE_VALUES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_tombstone ON {table}')
+        op.execute(f'DROP FUNCTION IF EXISTS {table}_tombstone()')
+    for table in TRACKED_TABLES + ('tombstones',):
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_change_seq ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS set_change_seq()')
+    for table in reversed(TRACKED_TABLES):
+        op.drop_index(f'ix_{table}_change_seq', table_name=table)
+        op.drop_column(table, 'change_seq')
+    op.drop_index('ix_tombstones_change_seq', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -1,19 +1,21 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
 from app.core.security import decode_access_token
-from app.db.session import get_db
-from app.crud.user import get_user_by_email
-from app.db.models.user import User
-import os
+from app.core.auth import resolve_principal
+from app.core.config import settings
+from app.core.principal import Principal
+from app.core.rate_limit import ROUTE_LIMITS, rate_limiter, retry_after
+from app.db.session import get_db, replica_router, wrote_recently
+from app.schemas.task import TaskFilter, TaskStatus, TaskPriority
+from datetime import datetime
+from typing import AsyncGenerator
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> Principal:
     try:
         payload = decode_access_token(token)
         email: str | None = payload.get("sub")
@@ -22,7 +24,40 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = await get_user_by_email(db, email)
-    if user is None:
+    principal = await resolve_principal(db, email)
+    if principal is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    db.info["principal_id"] = principal.id
+    return principal
+
+async def rate_limit(request: Request, current_user: Principal = Depends(get_current_user)) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    key = f"rl:{current_user.id}"
+    wait = await rate_limiter.take(key, settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST)
+    route = getattr(request.scope.get("route"), "path", None)
+    limit = ROUTE_LIMITS.get((request.method, route))
+    if not wait and limit is not None:
+        wait = await rate_limiter.take(f"{key}:{request.method} {route}", *limit)
+    if wait:
+        raise HTTPException(status_code=429, detail="Rate limit exceeded", headers={"Retry-After": retry_after(wait)})
+
+async def get_read_db(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)) -> AsyncGenerator[AsyncSession, None]:
+    if not replica_router.replicas or await wrote_recently(current_user.id):
+        yield db
+        return
+    replica = await replica_router.open_session()
+    if replica is None:
+        yield db
+        return
+    async with replica:
+        yield replica
+
+def get_task_filter(
+    status: list[TaskStatus] | None = Query(None),
+    priority: list[TaskPriority] | None = Query(None),
+    assigned_to: int | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+) -> TaskFilter:
+    return TaskFilter(status=status, priority=priority, assigned_to=assigned_to, due_before=due_before, due_after=due_after)
@@ -1,18 +1,34 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.db.models.user import User
-from app.db.session import get_db
+from app.api.dependencies import get_current_user, get_read_db
+from app.core.principal import Principal
+from app.core.serialization import dump_page
+from app.core.response_cache import response_cache, request_cache_key, pack, packed_response, task_comments_tag
+from app.db.session import get_db, is_primary
 from app.schemas.comment import CommentCreate, CommentOut
-from app.crud.comment import get_comments_by_task, create_comment
+from app.schemas.pagination import Page
+from app.crud.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.crud.comment import get_comment_rows_by_task, create_comment
 
 router = APIRouter(prefix="/tasks/{task_id}/comments", tags=["Comments"])
 
-@router.get("/", response_model=list[CommentOut])
-async def list_comments(task_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return await get_comments_by_task(db, task_id)
+@router.get("/", response_model=Page[CommentOut])
+async def list_comments(task_id: int, request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = None, db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    key = await response_cache.key(request_cache_key(request, "all"), [task_comments_tag(task_id)])
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return packed_response(cached)
+
+    async def load() -> bytes:
+        try:
+            rows, next_cursor = await get_comment_rows_by_task(db, task_id, limit=limit, cursor=cursor)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return pack(dump_page(rows, next_cursor))
+
+    return packed_response(await response_cache.load(key, load, store=is_primary(db)))
 
 @router.post("/", response_model=CommentOut, status_code=201)
-async def add_comment(task_id: int, comment_data: CommentCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def add_comment(task_id: int, comment_data: CommentCreate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     return await create_comment(db, task_id=task_id, user_id=current_user.id, comment_data=comment_data)
@@ -1,13 +1,69 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from app.api.dependencies import get_current_user
-from app.db.models.user import User
+from app.core.principal import Principal, principal_cache_stats
+from app.core.metrics import Family, metrics, render_metrics
+from app.core.response_cache import response_cache
+from app.core.events import change_feed
+from app.core.rate_limit import shedding_stats
+from app.db.engine import pool_stats
+from app.db.session import engine, replica_router
 
 router = APIRouter()
 
+def _counter_families() -> list[Family]:
+    # The principal cache has no loader, so nothing is ever coalesced there.
+    caches = [("principal", principal_cache_stats, ("hits", "misses")), ("response", response_cache.stats, ("hits", "misses", "coalesced"))]
+    feed = change_feed.stats
+    return [
+        ("cache_lookups_total", "counter", "Cache lookups by cache and result (coalesced: waited for another request's load).",
+         [({"cache": name, "result": result}, getattr(stats, result)) for name, stats, results in caches for result in results]),
+        ("change_feed_events_total", "counter", "Change feed events published, delivered to subscribers, dropped by the backend, or lost to a full subscriber buffer.",
+         [({"outcome": outcome}, getattr(feed, outcome)) for outcome in ("published", "delivered", "dropped", "overflowed")]),
+        ("requests_shed_total", "counter", "Requests rejected with 503 by load shedding, by reason.",
+         [({"reason": "in_flight"}, shedding_stats.shed_in_flight), ({"reason": "pool_wait"}, shedding_stats.shed_pool_wait)]),
+        ("requests_in_flight", "gauge", "Requests that have not started their response yet.", [({}, shedding_stats.in_flight)]),
+    ]
+
+def _pool_families() -> list[Family]:
+    # Only instrumented pools (QueuePool-based, not SQLite or PgBouncer's NullPool) report these.
+    pools = [("primary", pool_stats(engine))] + [(f"replica{i}", pool_stats(r.engine)) for i, r in enumerate(replica_router.replicas)]
+    pools = [(name, stats) for name, stats in pools if "checked_out" in stats]
+    families: list[Family] = [
+        ("db_pool_connections", "gauge", "Pool connections by state.",
+         [({"pool": name, "state": state}, stats[state]) for name, stats in pools for state in ("checked_out", "checked_in", "overflow")]),
+        ("db_pool_capacity", "gauge", "Pool size plus max overflow.", [({"pool": name}, stats["size"] + max(stats["max_overflow"], 0)) for name, stats in pools]),
+    ]
+    for name, key, kind, help_text in (
+        ("db_pool_saturation", "saturation", "gauge", "Checked-out connections as a fraction of capacity."),
+        ("db_pool_checkouts_total", "checkouts", "counter", "Connection checkouts."),
+        ("db_pool_checkout_timeouts_total", "checkout_timeouts", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT."),
+        ("db_pool_checkout_wait_seconds_total", "checkout_wait_seconds_total", "counter", "Time spent waiting for a connection."),
+        ("db_pool_checkout_wait_seconds_max", "checkout_wait_seconds_max", "gauge", "Longest wait for a connection."),
+        ("db_pool_checkout_wait_seconds_recent", "checkout_wait_seconds_recent", "gauge", "Moving average of the wait over roughly the last ten checkouts."),
+    ):
+        families.append((name, kind, help_text, [({"pool": pool}, stats[key]) for pool, stats in pools]))
+    return families
+
+metrics.collect(_counter_families)
+metrics.collect(_pool_families)
+
 @router.get("/healthz/public", tags=["Health"])
 async def public_health_check():
     return {"status": "ok", "message": "public check passed"}
 
 @router.get("/healthz", tags=["Health"])
-async def authenticated_health_check(current_user: User = Depends(get_current_user)):
-    return {"status": "ok", "user": current_user.email}
\ No newline at end of file
+async def authenticated_health_check(current_user: Principal = Depends(get_current_user)):
+    return {"status": "ok", "user": current_user.email}
+
+@router.get("/healthz/pool", tags=["Health"])
+async def pool_health_check(current_user: Principal = Depends(get_current_user)):
+    replicas = [
+        {"healthy": replica.healthy, "pool": pool_stats(replica.engine)}
+        for replica in replica_router.replicas
+    ]
+    return {"status": "ok", "pool": pool_stats(engine), "replicas": replicas}
+
+@router.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,46 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from collections.abc import AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.db.session import get_db
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectOut
-from app.db.models.user import User, UserRole
-from app.crud.project import get_projects, get_project, create_project, update_project, delete_project
+from app.api.dependencies import get_current_user, get_read_db
+from app.db.session import get_db, is_primary, open_read_session
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectOut, ProjectExpandedOut, ProjectSummaryOut
+from app.schemas.pagination import Page
+from app.crud.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.db.models.user import UserRole
+from app.db.models.project import Project
+from app.core.principal import Principal
+from app.core.etag import resource_etag, check_not_modified, if_match_versions
+from app.core.response_cache import response_cache, request_cache_key, pack, packed_response, owner_projects_tag
+from app.core.events import change_feed
+from app.core.config import settings
+from app.crud.project import get_projects, get_project, get_project_version, project_exists, create_project, update_project, delete_project
+from app.crud.summary import get_project_summary, get_project_summaries
+from app.crud.expand import InvalidInclude, parse_include, include_options, load_limited, expand
+from app.crud.export import EXPORT_FORMATS, stream_project_rows
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
-@router.get("/", response_model=list[ProjectOut])
-async def list_projects(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return await get_projects(db, owner_id=current_user.id)
+@router.get("/", response_model=Page[ProjectOut])
+async def list_projects(request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = None, include_summary: bool = False, include: str | None = None, db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    try:
+        tree = parse_include(Project, include)
+    except InvalidInclude as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    async def load() -> bytes:
+        try:
+            projects, next_cursor = await get_projects(db, owner_id=current_user.id, limit=limit, cursor=cursor, options=include_options(Project, tree))
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        if tree:
+            truncated = await load_limited(db, Project, projects, tree)
+            items = [ProjectExpandedOut.model_validate(expand(p, tree, truncated)) for p in projects]
+        else:
+            items = [ProjectOut.model_validate(p) for p in projects]
+        if include_summary:
+            summaries = await get_project_summaries(db, [p.id for p in projects])
+            items = [item.model_copy(update={"summary": ProjectSummaryOut.model_validate(summaries[item.id])}) for item in items]
+        if tree:
+            return pack(Page[ProjectExpandedOut](items=items, next_cursor=next_cursor).model_dump_json(exclude_unset=True).encode())
+        return pack(Page[ProjectOut](items=items, next_cursor=next_cursor))
+
+    # Summaries and included tasks follow task writes rather than project writes, so those variants are never cached.
+    if include_summary or tree:
+        return packed_response(await load())
+    key = await response_cache.key(request_cache_key(request, f"owner:{current_user.id}"), [owner_projects_tag(current_user.id)])
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return packed_response(cached)
+    return packed_response(await response_cache.load(key, load, store=is_primary(db)))
 
 @router.post("/", response_model=ProjectOut, status_code=201)
-async def create_new_project(project_data: ProjectCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_new_project(project_data: ProjectCreate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role not in [UserRole.admin, UserRole.manager]:
         raise HTTPException(status_code=403, detail="Only managers or admins can create projects")
     return await create_project(db, project_data=project_data, owner_id=current_user.id)
 
 @router.get("/{project_id}", response_model=ProjectOut)
-async def read_project(project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def read_project(project_id: int, response: Response, include_summary: bool = False, include: str | None = None, if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    try:
+        tree = parse_include(Project, include)
+    except InvalidInclude as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if tree:
+        project = await get_project(db, project_id, options=include_options(Project, tree))
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        truncated = await load_limited(db, Project, [project], tree)
+        item = ProjectExpandedOut.model_validate(expand(project, tree, truncated))
+        if include_summary:
+            item = item.model_copy(update={"summary": ProjectSummaryOut.model_validate(await get_project_summary(db, project_id))})
+        return packed_response(pack(item.model_dump_json(exclude_unset=True).encode()))
+    # The summary changes with the project's tasks, not its updated_at, so only the plain body gets an ETag.
+    if if_none_match is not None and not include_summary:
+        version = await get_project_version(db, project_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        check_not_modified(if_none_match, resource_etag(project_id, version))
     project = await get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    if include_summary:
+        return ProjectOut.model_validate(project).model_copy(update={"summary": ProjectSummaryOut.model_validate(await get_project_summary(db, project_id))})
+    response.headers["ETag"] = resource_etag(project.id, project.updated_at)
     return project
 
-@router.put("/{project_id}", response_model=ProjectOut)
-async def update_existing_project(project_id: int, updates: ProjectUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    project = await get_project(db, project_id)
-    if not project:
+@router.get("/{project_id}/summary", response_model=ProjectSummaryOut)
+async def read_project_summary(project_id: int, db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    if not await project_exists(db, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    if project.owner_id != current_user.id and current_user.role != UserRole.admin:
+    return await get_project_summary(db, project_id)
+
+async def _export_body(project_id: int, export_format: str) -> AsyncIterator[bytes]:
+    # Runs after export_project has closed the request's sessions, so the export opens its own.
+    encode, _ = EXPORT_FORMATS[export_format]
+    async with await open_read_session() as db:
+        async for chunk in encode(stream_project_rows(db, project_id)):
+            yield chunk
+
+@router.get("/{project_id}/export")
+async def export_project(project_id: int, export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"), db: AsyncSession = Depends(get_read_db), primary: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    if not await project_exists(db, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Dependency teardown only runs once the body has been sent; without this the export would hold a
+    # second connection, idle in a transaction, for its whole duration.
+    await db.close()
+    await primary.close()
+    _, media_type = EXPORT_FORMATS[export_format]
+    headers = {"Content-Disposition": f'attachment; filename="project-{project_id}.{export_format}"'}
+    return StreamingResponse(_export_body(project_id, export_format), media_type=media_type, headers=headers)
+
+async def _event_stream(project_id: int) -> AsyncIterator[bytes]:
+    async with change_feed.subscribe(project_id) as subscription:
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if message is None:
+                # Events were dropped (a slow client or a lost feed connection): refetch, then reconnect.
+                yield b"event: resync\ndata: {}\n\n"
+                return
+            yield b"data: " + message + b"\n\n"
+
+@router.get("/{project_id}/events")
+async def stream_project_events(project_id: int, db: AsyncSession = Depends(get_read_db), primary: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    if not await project_exists(db, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Dependency teardown only runs once the stream ends, so hand the connections back to the pool now
+    # rather than holding one for as long as the client stays subscribed.
+    await db.close()
+    await primary.close()
+    # Connect the feed before the 200 goes out, so a broken backend is an error rather than an empty stream.
+    await change_feed.start()
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_event_stream(project_id), media_type="text/event-stream", headers=headers)
+
+@router.put("/{project_id}", response_model=ProjectOut)
+async def update_existing_project(project_id: int, updates: ProjectUpdate, response: Response, if_match: str | None = Header(None), db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    owner_id = None if current_user.role == UserRole.admin else current_user.id
+    versions = if_match_versions(if_match, project_id)
+    project = await update_project(db, project_id, updates, owner_id=owner_id, versions=versions)
+    if project is None:
+        current = await get_project_version(db, project_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        if versions is not None and current not in versions:
+            raise HTTPException(status_code=412, detail="Project was modified", headers={"ETag": resource_etag(project_id, current)})
         raise HTTPException(status_code=403, detail="Not authorized to update this project")
-    return await update_project(db, project, updates)
+    response.headers["ETag"] = resource_etag(project.id, project.updated_at)
+    return project
 
 @router.delete("/{project_id}", status_code=204)
-async def remove_project(project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    project = await get_project(db, project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    if project.owner_id != current_user.id and current_user.role != UserRole.admin:
+async def remove_project(project_id: int, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    owner_id = None if current_user.role == UserRole.admin else current_user.id
+    if not await delete_project(db, project_id, owner_id=owner_id):
+        if not await project_exists(db, project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
         raise HTTPException(status_code=403, detail="Not authorized to delete this project")
-    await delete_project(db, project)
     return
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user, get_read_db
+from app.schemas.search import SearchHit
+from app.schemas.pagination import Page
+from app.crud.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.crud.search import search
+from app.db.models.user import UserRole
+from app.core.principal import Principal
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/", response_model=Page[SearchHit])
+async def search_tasks_and_comments(q: str = Query(..., min_length=1, max_length=200), project_id: int | None = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = None, db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    user_id = None if current_user.role == UserRole.admin else current_user.id
+    try:
+        hits, next_cursor = await search(db, q, user_id=user_id, project_id=project_id, limit=limit, cursor=cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"items": hits, "next_cursor": next_cursor}
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user, get_read_db
+from app.schemas.sync import SyncOut
+from app.crud.pagination import InvalidCursor, MAX_PAGE_SIZE
+from app.crud.sync import get_changes
+from app.db.models.user import UserRole
+from app.core.principal import Principal
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+@router.get("/", response_model=SyncOut)
+async def sync_changes(since: str | None = None, limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    user_id = None if current_user.role == UserRole.admin else current_user.id
+    try:
+        changes, next_token, has_more = await get_changes(db, since, user_id=user_id, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    return {
+        "projects": changes["project"],
+        "tasks": changes["task"],
+        "comments": changes["comment"],
+        "deleted": changes["tombstone"],
+        "next_token": next_token,
+        "has_more": has_more,
+    }
@@ -1,59 +1,212 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter, ValidationError
+from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.db.models.user import User, UserRole
-from app.db.session import get_db
-from app.schemas.task import TaskCreate, TaskUpdate, TaskOut
+from app.api.dependencies import get_current_user, get_read_db, get_task_filter
+from app.db.models.user import UserRole
+from app.db.models.task import Task
+from app.core.principal import Principal
+from app.core.etag import resource_etag, page_etag, check_not_modified, if_match_versions
+from app.core.serialization import dump_page
+from app.core.response_cache import response_cache, request_cache_key, pack, packed_response, project_tasks_tag, task_tag, task_comments_tag
+from app.db.session import get_db, is_primary
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskOut,
+    TaskExpandedOut,
+    TaskFilter,
+    TaskBulkError,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskImportResult,
+)
+from app.schemas.pagination import Page
+from app.crud.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.crud.project import get_project, project_exists
+from app.crud.expand import InvalidInclude, parse_include, include_options, load_limited, expand
+from app.crud.task_import import IMPORT_CHUNK_SIZE, iter_lines, iter_csv_records, iter_ndjson_records, import_tasks
 from app.crud.task import (
+    get_task_rows_by_project,
     get_tasks_by_project,
+    get_task_page_versions,
     get_task,
+    get_task_version,
+    task_exists,
     create_task,
+    create_tasks,
     update_task,
     delete_task,
     assign_task,
+    bulk_update_tasks,
+    TASK_SORT_PATTERN,
+    DEFAULT_TASK_SORT,
 )
 
 router = APIRouter(prefix="/projects/{project_id}/tasks", tags=["Tasks"])
 
-@router.get("/", response_model=list[TaskOut])
-async def list_tasks(project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return await get_tasks_by_project(db, project_id)
+MAX_BULK_TASKS = 5000
+_task_create_adapter = TypeAdapter(TaskCreate)
+
+@router.get("/", response_model=Page[TaskOut])
+async def list_tasks(project_id: int, request: Request, filters: TaskFilter = Depends(get_task_filter), sort: str = Query(DEFAULT_TASK_SORT, pattern=TASK_SORT_PATTERN), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = None, include: str | None = None, if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    if include:
+        return await _list_expanded_tasks(db, project_id, include, filters=filters, sort=sort, limit=limit, cursor=cursor)
+    key = await response_cache.key(request_cache_key(request, "all"), [project_tasks_tag(project_id)])
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return packed_response(cached, if_none_match)
+
+    async def load() -> bytes:
+        try:
+            rows, next_cursor = await get_task_rows_by_project(db, project_id, filters=filters, sort=sort, limit=limit, cursor=cursor)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return pack(dump_page(rows, next_cursor), page_etag(((r.id, r.updated_at) for r in rows), next_cursor))
+
+    if if_none_match is not None:
+        # Revalidate against (id, updated_at) of the page before loading and serializing full rows.
+        try:
+            versions, next_cursor = await get_task_page_versions(db, project_id, filters=filters, sort=sort, limit=limit, cursor=cursor)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        check_not_modified(if_none_match, page_etag(((v.id, v.updated_at) for v in versions), next_cursor))
+    return packed_response(await response_cache.load(key, load, store=is_primary(db)))
 
 @router.post("/", response_model=TaskOut, status_code=201)
-async def create_new_task(project_id: int, task_data: TaskCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_new_task(project_id: int, task_data: TaskCreate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     return await create_task(db, project_id=project_id, task_data=task_data)
 
+@router.post("/bulk", response_model=TaskBulkResult, status_code=201)
+async def create_tasks_in_bulk(project_id: int, payload: list[dict[str, Any]] = Body(..., max_length=MAX_BULK_TASKS), atomic: bool = True, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    valid: list[TaskCreate] = []
+    errors: list[TaskBulkError] = []
+    for index, item in enumerate(payload):
+        try:
+            valid.append(_task_create_adapter.validate_python(item))
+        except ValidationError as exc:
+            errors.append(TaskBulkError(index=index, errors=exc.errors(include_url=False, include_context=False)))
+    if errors and atomic:
+        raise HTTPException(status_code=422, detail=[e.model_dump() for e in errors])
+    if not await get_project(db, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    created = await create_tasks(db, project_id=project_id, tasks=valid)
+    return {"created": created, "errors": errors}
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks_from_upload(project_id: int, request: Request, import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"), dry_run: bool = False, chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=MAX_BULK_TASKS), db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    if not await project_exists(db, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    parse = iter_csv_records if import_format == "csv" else iter_ndjson_records
+    return await import_tasks(db, project_id, parse(iter_lines(request.stream())), dry_run=dry_run, chunk_size=chunk_size)
+
+@router.patch("/bulk", response_model=TaskBulkUpdateResult)
+async def update_tasks_in_bulk(project_id: int, payload: TaskBulkUpdate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    if payload.ids is not None and len(payload.ids) > MAX_BULK_TASKS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BULK_TASKS} ids per request")
+    changes = payload.changes.model_dump(exclude_unset=True)
+    if "assigned_to" in changes and current_user.role not in [UserRole.manager, UserRole.admin]:
+        raise HTTPException(status_code=403, detail="Only managers or admins can assign tasks")
+    # Same rules as the single-task endpoints: assignment needs manager/admin, other fields need the assignee or an admin.
+    restrict = changes.keys() - {"assigned_to"} and current_user.role != UserRole.admin
+    updated, refused = await bulk_update_tasks(
+        db,
+        project_id,
+        changes,
+        ids=payload.ids,
+        filters=payload.filter,
+        assignee_id=current_user.id if restrict else None,
+    )
+    return {"updated": updated, "refused": refused}
+
+async def _list_expanded_tasks(db: AsyncSession, project_id: int, include: str, **params: Any) -> Response:
+    # Related rows come from one batched query per included path; the ETag/row fast paths don't cover them.
+    try:
+        tree = parse_include(Task, include)
+        tasks, next_cursor = await get_tasks_by_project(db, project_id, options=include_options(Task, tree), **params)
+    except (InvalidInclude, InvalidCursor) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    truncated = await load_limited(db, Task, tasks, tree)
+    page = Page[TaskExpandedOut](items=[TaskExpandedOut.model_validate(expand(t, tree, truncated)) for t in tasks], next_cursor=next_cursor)
+    return packed_response(pack(page.model_dump_json(exclude_unset=True).encode()))
+
 @router.get("/{task_id}", response_model=TaskOut)
-async def read_task(task_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    task = await get_task(db, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return task
+async def read_task(task_id: int, request: Request, include: str | None = None, if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    if include:
+        return await _read_expanded_task(db, request, task_id, include)
+    key = await response_cache.key(request_cache_key(request, "all"), [task_tag(task_id)])
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return packed_response(cached, if_none_match)
+
+    async def load() -> bytes:
+        task = await get_task(db, task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return pack(TaskOut.model_validate(task), resource_etag(task.id, task.updated_at))
+
+    if if_none_match is not None:
+        version = await get_task_version(db, task_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        check_not_modified(if_none_match, resource_etag(task_id, version))
+    return packed_response(await response_cache.load(key, load, store=is_primary(db)))
+
+async def _read_expanded_task(db: AsyncSession, request: Request, task_id: int, include: str) -> Response:
+    try:
+        tree = parse_include(Task, include)
+    except InvalidInclude as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    tags = [task_tag(task_id)] + ([task_comments_tag(task_id)] if "comments" in tree else [])
+    key = await response_cache.key(request_cache_key(request, "all"), tags)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return packed_response(cached)
+
+    async def load() -> bytes:
+        task = await get_task(db, task_id, options=include_options(Task, tree))
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        truncated = await load_limited(db, Task, [task], tree)
+        return pack(TaskExpandedOut.model_validate(expand(task, tree, truncated)).model_dump_json(exclude_unset=True).encode())
+
+    return packed_response(await response_cache.load(key, load, store=is_primary(db)))
 
 @router.put("/{task_id}", response_model=TaskOut)
-async def update_existing_task(task_id: int, updates: TaskUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    task = await get_task(db, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.assigned_to != current_user.id and current_user.role != UserRole.admin:
+async def update_existing_task(task_id: int, updates: TaskUpdate, response: Response, if_match: str | None = Header(None), db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    assignee_id = None if current_user.role == UserRole.admin else current_user.id
+    versions = if_match_versions(if_match, task_id)
+    task = await update_task(db, task_id, updates, assignee_id=assignee_id, versions=versions)
+    if task is None:
+        current = await get_task_version(db, task_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if versions is not None and current not in versions:
+            raise HTTPException(status_code=412, detail="Task was modified", headers={"ETag": resource_etag(task_id, current)})
         raise HTTPException(status_code=403, detail="Not authorized to update this task")
-    return await update_task(db, task, updates)
+    response.headers["ETag"] = resource_etag(task.id, task.updated_at)
+    return task
 
 @router.delete("/{task_id}", status_code=204)
-async def remove_task(task_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    task = await get_task(db, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.assigned_to != current_user.id and current_user.role != UserRole.admin:
+async def remove_task(task_id: int, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    assignee_id = None if current_user.role == UserRole.admin else current_user.id
+    if not await delete_task(db, task_id, assignee_id=assignee_id):
+        if not await task_exists(db, task_id):
+            raise HTTPException(status_code=404, detail="Task not found")
         raise HTTPException(status_code=403, detail="Not authorized to delete this task")
-    await delete_task(db, task)
 
 @router.put("/{task_id}/assign", response_model=TaskOut)
-async def assign_task_to_user(task_id: int, user_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def assign_task_to_user(task_id: int, user_id: int, response: Response, if_match: str | None = Header(None), db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role not in [UserRole.manager, UserRole.admin]:
         raise HTTPException(status_code=403, detail="Only managers or admins can assign tasks")
-    task = await get_task(db, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return await assign_task(db, task, user_id)
+    versions = if_match_versions(if_match, task_id)
+    task = await assign_task(db, task_id, user_id, versions=versions)
+    if task is None:
+        current = await get_task_version(db, task_id) if versions is not None else None
+        if current is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        raise HTTPException(status_code=412, detail="Task was modified", headers={"ETag": resource_etag(task_id, current)})
+    response.headers["ETag"] = resource_etag(task.id, task.updated_at)
+    return task
@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
 from app.db.session import get_db
-from app.db.models.user import User
+from app.core.principal import Principal
+from app.core.etag import resource_etag, check_not_modified, if_match_versions
 from app.schemas.user import UserUpdate, UserOut
+from app.crud.user import update_user
+from app.core.security import password_hasher
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("/me", response_model=UserOut)
-async def get_profile(current_user: User = Depends(get_current_user)):
+async def get_profile(response: Response, if_none_match: str | None = Header(None), current_user: Principal = Depends(get_current_user)):
+    if current_user.updated_at is not None:
+        etag = resource_etag(current_user.id, current_user.updated_at)
+        check_not_modified(if_none_match, etag)
+        response.headers["ETag"] = etag
     return current_user
 
 @router.put("/me", response_model=UserOut)
-async def update_profile(update_data: UserUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_profile(update_data: UserUpdate, response: Response, if_match: str | None = Header(None), db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    versions = if_match_versions(if_match, current_user.id)
+    changes: dict[str, str] = {}
     if update_data.full_name:
-        current_user.full_name = update_data.full_name
+        changes["full_name"] = update_data.full_name
     if update_data.password:
-        from app.core.security import get_password_hash
-        current_user.hashed_password = get_password_hash(update_data.password)
-
-    db.add(current_user)
-    await db.commit()
-    await db.refresh(current_user)
-    return current_user
+        changes["hashed_password"] = await password_hasher.hash(update_data.password)
+    user = await update_user(db, current_user.id, changes, versions=versions)
+    if user is None:
+        if versions is not None:
+            raise HTTPException(status_code=412, detail="Profile was modified")
+        raise HTTPException(status_code=404, detail="User not found")
+    response.headers["ETag"] = resource_etag(user.id, user.updated_at)
+    return user
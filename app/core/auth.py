@@ -1,4 +1,3 @@
-import os
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
@@ -8,18 +7,27 @@ from typing import Annotated
 from app.db.session import get_db
 from app.crud.user import get_user_by_email
 from app.core.security import decode_access_token
-from app.db.models.user import User, UserRole
+from app.core.principal import Principal, get_cached_principal, cache_principal
+from app.db.models.user import UserRole
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
+async def resolve_principal(db: AsyncSession, email: str) -> Principal | None:
+    principal = await get_cached_principal(email)
+    if principal is not None:
+        return principal
+    user = await get_user_by_email(db, email)
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    await cache_principal(principal)
+    return principal
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> User:
+) -> Principal:
     try:
         payload = decode_access_token(token)
         email: str | None = payload.get("sub")
@@ -36,18 +44,19 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    user = await get_user_by_email(db, email)
-    if user is None:
+    principal = await resolve_principal(db, email)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    db.info["principal_id"] = principal.id
+    return principal
 
 def require_role(required_role: UserRole):
     async def role_checker(
-            current_user: Annotated[User, Depends(get_current_user)]
-    ) -> User:
+            current_user: Annotated[Principal, Depends(get_current_user)]
+    ) -> Principal:
         if current_user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,3 +1,4 @@
+import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
@@ -9,6 +10,73 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    DB_PGBOUNCER: bool = False
+    DB_POOL_WARM: bool = True
+
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_RETRY_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_CACHE_URL: str | None = None
+
+    PRINCIPAL_CACHE_URL: str | None = None
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    RESPONSE_CACHE_URL: str | None = None
+    # Unset means 30 with RESPONSE_CACHE_URL and off without it: see response_cache_ttl.
+    RESPONSE_CACHE_TTL_SECONDS: float | None = None
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000
+
+    CHANGE_FEED_URL: str | None = None
+    CHANGE_FEED_BUFFER_SIZE: int = 256
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0
+
+    METRICS_ENABLED: bool = True
+    # Set (gunicorn.conf.py does) to serve every worker's metrics from any worker's /metrics.
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_SNAPSHOT_SECONDS: float = 5.0
+    SERVER_TIMING: bool = False
+
+    QUERY_WATCH: bool = False
+    QUERY_WATCH_REPEAT_THRESHOLD: int = 5
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_URL: str | None = None
+    RATE_LIMIT_USER_RATE: float = 20.0
+    RATE_LIMIT_USER_BURST: int = 100
+    RATE_LIMIT_MAX_ENTRIES: int = 100_000
+
+    SHED_MAX_IN_FLIGHT: int = 0
+    SHED_POOL_WAIT_SECONDS: float = 1.0
+
+    @property
+    def response_cache_ttl(self) -> float:
+        # Tag versions live in the cache backend, so without a shared one an invalidation only reaches the
+        # worker that made it. Caching is therefore opt-in for the per-worker store.
+        if self.RESPONSE_CACHE_TTL_SECONDS is not None:
+            return self.RESPONSE_CACHE_TTL_SECONDS
+        return 30.0 if self.RESPONSE_CACHE_URL else 0.0
+
+    def per_worker_state(self) -> list[str]:
+        # Settings that keep state in each worker's memory where all workers must see the same state.
+        problems = []
+        if self.response_cache_ttl > 0 and not self.RESPONSE_CACHE_URL:
+            problems.append("the response cache is enabled without RESPONSE_CACHE_URL, so invalidations would not reach other workers")
+        shared_writes = self.READ_YOUR_WRITES_CACHE_URL not in (None, "", "memory://")
+        if self.DATABASE_REPLICA_URLS.strip() and not shared_writes:
+            problems.append("replicas are configured without READ_YOUR_WRITES_CACHE_URL, so a write would not keep the writer's reads on the primary in other workers")
+        return problems
 
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE),
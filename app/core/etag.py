@@ -0,0 +1,51 @@
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+from fastapi import HTTPException
+
+# Strong validators for single resources are "<id>.<updated_at>", so an If-Match value can be turned
+# back into an updated_at condition on the conditional UPDATE without an extra read.
+_VERSION_FORMAT = "%Y%m%d%H%M%S%f"
+
+def resource_etag(resource_id: int, updated_at: datetime) -> str:
+    return f'"{resource_id}.{updated_at.strftime(_VERSION_FORMAT)}"'
+
+def page_etag(versions: Iterable[tuple[Any, datetime]], next_cursor: str | None) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for resource_id, updated_at in versions:
+        digest.update(f"{resource_id}.{updated_at.strftime(_VERSION_FORMAT)};".encode())
+    digest.update((next_cursor or "").encode())
+    return f'"p.{digest.hexdigest()}"'
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def not_modified(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches.
+    if if_none_match is None:
+        return False
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in _tags(if_none_match))
+
+def check_not_modified(if_none_match: str | None, etag: str) -> None:
+    if not_modified(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+
+def if_match_versions(if_match: str | None, resource_id: int) -> list[datetime] | None:
+    # None means no precondition; otherwise the updated_at values the write is allowed to replace.
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in _tags(if_match):
+        if tag.startswith("W/"):
+            continue  # If-Match requires strong comparison
+        tag_id, _, version = tag.strip('"').partition(".")
+        if tag_id != str(resource_id):
+            continue
+        try:
+            versions.append(datetime.strptime(version, _VERSION_FORMAT))
+        except ValueError:
+            continue
+    if not versions:
+        raise HTTPException(status_code=412, detail="Precondition failed")
+    return versions
@@ -0,0 +1,201 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.serialization import dumps
+
+# NOTIFY payloads are capped at 8000 bytes; larger events are sent without their row data.
+MAX_EVENT_BYTES = 7900
+
+Dispatch = Callable[[bytes], None]
+
+
+@dataclass
+class FeedStats:
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    overflowed: int = 0
+
+
+class Subscription:
+    # A bounded buffer between the feed and one client. Offering never waits: when the client falls
+    # behind, its backlog is discarded and it gets a single None, telling the stream to send a resync.
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(max_size + 1)
+        self.max_size = max_size
+        self.overflowed = False
+
+    def offer(self, message: bytes | None) -> bool:
+        if self.overflowed:
+            return False
+        if message is not None and self.queue.qsize() < self.max_size:
+            self.queue.put_nowait(message)
+            return True
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+        return False
+
+
+class PubSubBackend(ABC):
+    # Whether publishes can only reach this process, so they can be skipped when nobody here listens.
+    local_only = False
+
+    @abstractmethod
+    async def start(self, dispatch: Dispatch, reset: Callable[[], None]) -> None: ...
+
+    @abstractmethod
+    def publish(self, message: bytes) -> bool: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class MemoryPubSub(PubSubBackend):
+    # Single-process stand-in: publishing dispatches straight to this process's subscribers.
+    local_only = True
+
+    def __init__(self) -> None:
+        self._dispatch: Dispatch | None = None
+
+    async def start(self, dispatch: Dispatch, reset: Callable[[], None]) -> None:
+        self._dispatch = dispatch
+
+    def publish(self, message: bytes) -> bool:
+        if self._dispatch is not None:
+            self._dispatch(message)
+        return True
+
+    async def close(self) -> None:
+        self._dispatch = None
+
+
+class PostgresPubSub(PubSubBackend):
+    # Every worker LISTENs on one channel and filters by project locally. Writers hand NOTIFYs to a
+    # bounded outbox that a background task sends, so a slow or broken connection never delays a write.
+    def __init__(self, dsn: str, channel: str = "change_feed", max_pending: int = 10_000):
+        self.dsn = dsn
+        self.channel = channel
+        self._outbox: asyncio.Queue[bytes] = asyncio.Queue(max_pending)
+        self._listener: Any = None
+        self._sender: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> Any:
+        try:
+            import asyncpg
+        except ImportError as exc:
+            raise RuntimeError("The 'asyncpg' package is required for postgresql:// change feed URLs") from exc
+        return await asyncpg.connect(self.dsn)
+
+    async def start(self, dispatch: Dispatch, reset: Callable[[], None]) -> None:
+        async with self._lock:
+            if self._listener is not None and not self._listener.is_closed():
+                return
+            listener = await self._connect()
+            await listener.add_listener(self.channel, lambda _conn, _pid, _channel, payload: dispatch(payload.encode()))
+
+            def terminated(_conn: Any) -> None:
+                # Notifications sent while disconnected are lost, so every subscriber has to resync.
+                self._listener = None
+                reset()
+
+            listener.add_termination_listener(terminated)
+            self._listener = listener
+
+    def publish(self, message: bytes) -> bool:
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.get_running_loop().create_task(self._send())
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _send(self) -> None:
+        conn = await self._connect()
+        try:
+            while True:
+                message = await self._outbox.get()
+                await conn.execute("SELECT pg_notify($1, $2)", self.channel, message.decode())
+        finally:
+            await conn.close()
+
+    async def close(self) -> None:
+        if self._sender is not None:
+            self._sender.cancel()
+            self._sender = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+
+def create_pubsub_backend(url: str | None) -> PubSubBackend:
+    if not url or url == "memory://":
+        return MemoryPubSub()
+    if url.startswith(("postgresql://", "postgres://", "postgresql+asyncpg://")):
+        return PostgresPubSub(url.replace("postgresql+asyncpg://", "postgresql://", 1))
+    raise ValueError(f"Unsupported change feed URL: {url}")
+
+
+class ChangeFeed:
+    def __init__(self, backend: PubSubBackend, buffer_size: int):
+        self.backend = backend
+        self.buffer_size = buffer_size
+        self.stats = FeedStats()
+        self._subscribers: defaultdict[int, set[Subscription]] = defaultdict(set)
+
+    @property
+    def active(self) -> bool:
+        return not self.backend.local_only or bool(self._subscribers)
+
+    async def start(self) -> None:
+        await self.backend.start(self._dispatch, self._reset)
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: int) -> AsyncIterator[Subscription]:
+        await self.start()
+        subscription = Subscription(self.buffer_size)
+        self._subscribers[project_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[project_id]
+
+    def publish(self, project_id: int, event: dict[str, Any]) -> None:
+        if not self.active:
+            return
+        body = dumps(event)
+        if len(body) > MAX_EVENT_BYTES:
+            body = dumps({k: v for k, v in event.items() if k != "data"})
+        self.stats.published += 1
+        if not self.backend.publish(b"%d\n%s" % (project_id, body)):
+            self.stats.dropped += 1
+
+    def _dispatch(self, message: bytes) -> None:
+        project_id, _, body = message.partition(b"\n")
+        if not project_id.isdigit():
+            return
+        for subscription in tuple(self._subscribers.get(int(project_id), ())):
+            if subscription.offer(body):
+                self.stats.delivered += 1
+            else:
+                self.stats.overflowed += 1
+
+    def _reset(self) -> None:
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.offer(None)
+
+change_feed = ChangeFeed(create_pubsub_backend(settings.CHANGE_FEED_URL), settings.CHANGE_FEED_BUFFER_SIZE)
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.events import change_feed
+from app.core.metrics import metrics, snapshots
+from app.core.security import pwd_context
+from app.db.session import engine, replica_router
+
+logger = logging.getLogger(__name__)
+
+# Start of this worker when nothing better is known; gunicorn.conf.py sets WORKER_STARTED_AT at fork.
+_imported_at = time.time()
+
+
+async def warm_pool(engine: AsyncEngine) -> int:
+    # Opens the pool's persistent connections side by side, so the first requests don't each pay for
+    # connect, auth and asyncpg's type introspection.
+    count = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    connections = [engine.connect() for _ in range(count)]
+    try:
+        await asyncio.gather(*(connection.start() for connection in connections))
+        await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in connections))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+    return count
+
+
+async def warm_up() -> None:
+    engines = [engine, *(replica.engine for replica in replica_router.replicas)]
+    if settings.DB_POOL_WARM:
+        results = await asyncio.gather(*(warm_pool(e) for e in engines), return_exceptions=True)
+        for e, result in zip(engines, results):
+            if isinstance(result, BaseException):
+                # Serve anyway: connections will be opened on demand once the database is reachable.
+                logger.warning("Could not warm the pool for %s: %s", e.url.render_as_string(hide_password=True), result)
+    # passlib picks and loads its bcrypt backend on first use; do it here rather than in the first login.
+    pwd_context.handler().get_backend()
+    if not change_feed.backend.local_only:
+        try:
+            await change_feed.start()
+        except (OSError, RuntimeError) as exc:
+            logger.warning("Could not start the change feed listener: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # The server only starts accepting on this worker once startup returns, so warm-up is never
+    # paid for by a request.
+    started = time.perf_counter()
+    await warm_up()
+    warm_seconds = time.perf_counter() - started
+    ready_seconds = time.time() - float(os.environ.get("WORKER_STARTED_AT", _imported_at))
+    metrics.startup.update(warm_up=round(warm_seconds, 6), ready=round(ready_seconds, 6))
+    logger.info("Worker %d ready %.0f ms after start (warm-up %.0f ms)", os.getpid(), ready_seconds * 1000, warm_seconds * 1000)
+    snapshot_task = asyncio.create_task(snapshots.run()) if snapshots is not None else None
+    try:
+        yield
+    finally:
+        # Runs after the server has finished in-flight requests on shutdown.
+        if snapshot_task is not None:
+            snapshot_task.cancel()
+            snapshots.remove()
+        await change_feed.backend.close()
+        for e in (engine, *(replica.engine for replica in replica_router.replicas)):
+            await e.dispose()
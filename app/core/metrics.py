@@ -0,0 +1,278 @@
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, str]
+# A metric family for MetricsRegistry.collect: name, type, help text and (labels, value) samples.
+Family = tuple[str, str, str, list[tuple[dict[str, Any], float]]]
+
+
+@dataclass
+class RequestMetrics:
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+
+
+current_request: ContextVar[RequestMetrics | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total, out = 0, []
+        for bound, count in zip((*(repr(b) for b in self.buckets), "+Inf"), self.counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+
+class MetricsRegistry:
+    # Per-process counters keyed by (method, route template); route templates keep label cardinality bounded.
+    def __init__(self) -> None:
+        self.latency: defaultdict[Labels, Histogram] = defaultdict(Histogram)
+        self.responses: defaultdict[tuple[str, str, int], int] = defaultdict(int)
+        self.db_statements: defaultdict[Labels, int] = defaultdict(int)
+        self.db_seconds: defaultdict[Labels, float] = defaultdict(float)
+        self.db_rows: defaultdict[Labels, int] = defaultdict(int)
+        self.startup: dict[str, float] = {}
+        self.collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def collect(self, collector: Callable[[], Iterable[Family]]) -> None:
+        # For state kept elsewhere (caches, pools, the change feed): read when /metrics is rendered.
+        self.collectors.append(collector)
+
+    def record(self, method: str, route: str, status: int, seconds: float, db: RequestMetrics) -> None:
+        labels = (method, route)
+        self.latency[labels].observe(seconds)
+        self.responses[(method, route, status)] += 1
+        self.db_statements[labels] += db.statements
+        self.db_seconds[labels] += db.db_seconds
+        self.db_rows[labels] += db.rows
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        def labels(method: str, route: str, **extra: Any) -> str:
+            pairs = [("method", method), ("route", route), *extra.items()]
+            return ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs)
+
+        lines += [
+            "# HELP http_request_duration_seconds Time from receiving the request to sending the response headers.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            for bound, count in histogram.cumulative():
+                lines.append(f"http_request_duration_seconds_bucket{{{labels(method, route, le=bound)}}} {count}")
+            lines.append(f"http_request_duration_seconds_sum{{{labels(method, route)}}} {histogram.sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels(method, route)}}} {histogram.count}")
+        lines += ["# HELP http_responses_total Responses by status code.", "# TYPE http_responses_total counter"]
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f"http_responses_total{{{labels(method, route, status=status)}}} {count}")
+        for name, help_text, values in (
+            ("db_statements_total", "SQL statements executed while handling requests.", self.db_statements),
+            ("db_statement_seconds_total", "Time spent executing SQL statements.", self.db_seconds),
+            ("db_rows_total", "Rows returned or affected, as reported by the driver.", self.db_rows),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), value in sorted(values.items()):
+                lines.append(f"{name}{{{labels(method, route)}}} {value}")
+        if self.startup:
+            lines += [
+                "# HELP worker_startup_seconds How long this worker took to become ready, by phase.",
+                "# TYPE worker_startup_seconds gauge",
+            ]
+            for phase, seconds in self.startup.items():
+                lines.append(f'worker_startup_seconds{{phase="{phase}"}} {seconds}')
+        for collector in self.collectors:
+            for name, kind, help_text, samples in collector():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for sample_labels, value in samples:
+                    pairs = ",".join(f'{k}="{_escape(str(v))}"' for k, v in sample_labels.items())
+                    lines.append(f"{name}{{{pairs}}} {value}" if pairs else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def with_labels(text: str, **labels: str) -> str:
+    # Adds labels to every sample of rendered metrics. The value is split off the end because label values
+    # (route templates) may themselves contain braces.
+    extra = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    lines = []
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, _, value = line.rpartition(" ")
+            series = f"{series[:-1]},{extra}}}" if series.endswith("}") else f"{series}{{{extra}}}"
+            line = f"{series} {value}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def merge(texts: Iterable[str]) -> str:
+    # The text format wants each family's samples together under one HELP/TYPE.
+    headers: dict[str, list[str]] = {}
+    samples: defaultdict[str, list[str]] = defaultdict(list)
+    for text in texts:
+        family = ""
+        for line in text.splitlines():
+            if line.startswith(("# HELP ", "# TYPE ")):
+                family = line.split(" ", 3)[2]
+                if len(headers.setdefault(family, [])) < 2 and line not in headers[family]:
+                    headers[family].append(line)
+            elif line:
+                samples[family].append(line)
+    return "\n".join(line for family, lines in headers.items() for line in (*lines, *samples[family])) + "\n"
+
+
+class WorkerSnapshots:
+    # Under gunicorn a scrape reaches whichever worker accepts it. Each worker writes its metrics, labelled
+    # with its pid, to a shared directory every `interval` seconds, and the worker that answers /metrics
+    # serves all of them. Files of workers that stopped writing are ignored after a few intervals.
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.prom")
+
+    def write(self, text: str) -> None:
+        path = self.path(os.getpid())
+        with open(f"{path}.tmp", "w") as f:
+            f.write(text)
+        os.replace(f"{path}.tmp", path)
+
+    def others(self) -> list[str]:
+        texts, own, cutoff = [], self.path(os.getpid()), time.time() - 3 * self.interval
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".prom") or entry.path == own:
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    continue
+                with open(entry.path) as f:
+                    texts.append(f.read())
+            except FileNotFoundError:
+                continue  # that worker just exited
+        return texts
+
+    def remove(self, pid: int | None = None) -> None:
+        try:
+            os.remove(self.path(pid or os.getpid()))
+        except FileNotFoundError:
+            pass
+
+    async def run(self) -> None:
+        while True:
+            self.write(worker_metrics())
+            await asyncio.sleep(self.interval)
+
+
+metrics = MetricsRegistry()
+snapshots = WorkerSnapshots(settings.METRICS_MULTIPROC_DIR, settings.METRICS_SNAPSHOT_SECONDS) if settings.METRICS_MULTIPROC_DIR else None
+
+
+def worker_metrics() -> str:
+    return with_labels(metrics.render(), worker=str(os.getpid()))
+
+
+def render_metrics() -> str:
+    # This worker's metrics, or with METRICS_MULTIPROC_DIR every live worker's, each labelled by pid.
+    if snapshots is None:
+        return metrics.render()
+    own = worker_metrics()
+    snapshots.write(own)
+    return merge([own, *snapshots.others()])
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if current_request.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    request = current_request.get()
+    if request is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        request.db_seconds += time.perf_counter() - started.pop()
+    request.statements += 1
+    request.rows += max(getattr(cursor, "rowcount", 0) or 0, 0)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware: no extra task per request, and the context variable
+    # set here is the one the engine hooks see while the route runs.
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = RequestMetrics()
+        token = current_request.set(request)
+        started = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def finish() -> float:
+            nonlocal recorded
+            elapsed = time.perf_counter() - started
+            if not recorded:
+                recorded = True
+                route = scope.get("route")
+                metrics.record(scope["method"], getattr(route, "path", "unmatched"), status, elapsed, request)
+            return elapsed
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Recorded at the headers so streaming responses measure time to first byte, not stream length.
+                elapsed = finish()
+                if self.server_timing:
+                    app_ms = max(elapsed - request.db_seconds, 0.0) * 1000
+                    value = f"app;dur={app_ms:.1f}, db;dur={request.db_seconds * 1000:.1f};desc=\"{request.statements} queries\""
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", value.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+            current_request.reset(token)
@@ -0,0 +1,62 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.cache import CacheStats, create_cache_backend
+from app.core.config import settings
+from app.db.models.user import User, UserRole
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    full_name: str | None
+    role: UserRole
+    is_active: bool
+    updated_at: datetime | None = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, full_name=user.full_name, role=user.role, is_active=user.is_active, updated_at=user.updated_at)
+
+    def to_json(self) -> bytes:
+        return json.dumps({
+            "id": self.id,
+            "email": self.email,
+            "full_name": self.full_name,
+            "role": self.role.value,
+            "is_active": self.is_active,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }).encode()
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "Principal":
+        data = json.loads(raw)
+        return cls(
+            id=data["id"],
+            email=data["email"],
+            full_name=data["full_name"],
+            role=UserRole(data["role"]),
+            is_active=data["is_active"],
+            updated_at=datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None,
+        )
+
+principal_cache = create_cache_backend(settings.PRINCIPAL_CACHE_URL, settings.PRINCIPAL_CACHE_MAX_ENTRIES)
+principal_cache_stats = CacheStats()
+
+def _key(subject: str) -> str:
+    return f"principal:{subject}"
+
+async def get_cached_principal(subject: str) -> Principal | None:
+    raw = await principal_cache.get(_key(subject))
+    if raw is None:
+        principal_cache_stats.misses += 1
+        return None
+    principal_cache_stats.hits += 1
+    return Principal.from_json(raw)
+
+async def cache_principal(principal: Principal) -> None:
+    await principal_cache.set(_key(principal.email), principal.to_json(), settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+async def invalidate_principal(subject: str) -> None:
+    await principal_cache.delete(_key(subject))
@@ -0,0 +1,164 @@
+import functools
+import inspect
+import logging
+import re
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Statements allowed per call on PostgreSQL, by (method, route template). These are worst cases: a cold
+# principal cache, a response cache miss, every ?include= path, the 412/404 fallbacks. Bulk creates are
+# batched 1000 rows per INSERT (SQLite inserts them one by one). Imports run two statements plus one per
+# chunk, so their entry is None: listed, but not bounded. tests/test_query_budgets.py fails for any route
+# missing from this table.
+ROUTE_BUDGETS: dict[tuple[str, str], int | None] = {
+    ("GET", "/"): 0,
+    ("POST", "/auth/register"): 2,
+    ("POST", "/auth/login"): 1,
+    ("GET", "/users/me"): 1,
+    ("PUT", "/users/me"): 3,
+    ("GET", "/projects/"): 9,
+    ("POST", "/projects/"): 2,
+    ("GET", "/projects/{project_id}"): 9,
+    ("PUT", "/projects/{project_id}"): 3,
+    ("DELETE", "/projects/{project_id}"): 3,
+    ("GET", "/projects/{project_id}/summary"): 4,
+    ("GET", "/projects/{project_id}/export"): 3,
+    ("GET", "/projects/{project_id}/events"): 2,
+    ("GET", "/projects/{project_id}/tasks/"): 5,
+    ("POST", "/projects/{project_id}/tasks/"): 2,
+    ("POST", "/projects/{project_id}/tasks/bulk"): 6,
+    ("POST", "/projects/{project_id}/tasks/import"): None,
+    ("PATCH", "/projects/{project_id}/tasks/bulk"): 3,
+    ("GET", "/projects/{project_id}/tasks/{task_id}"): 5,
+    ("PUT", "/projects/{project_id}/tasks/{task_id}"): 3,
+    ("DELETE", "/projects/{project_id}/tasks/{task_id}"): 3,
+    ("PUT", "/projects/{project_id}/tasks/{task_id}/assign"): 3,
+    ("GET", "/tasks/{task_id}/comments/"): 2,
+    ("POST", "/tasks/{task_id}/comments/"): 3,
+    ("GET", "/search/"): 2,
+    ("GET", "/sync/"): 7,
+    ("GET", "/healthz/public"): 0,
+    ("GET", "/healthz"): 1,
+    ("GET", "/healthz/pool"): 1,
+    ("GET", "/metrics"): 0,
+}
+
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_PARAM_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def statement_shape(statement: str) -> str:
+    # Bind parameters, and expanded IN lists of any length, reduce to the same shape.
+    return _PARAM_LIST.sub("?, ...", _PARAM.sub("?", " ".join(statement.split())))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        shapes = Counter(statement_shape(s) for s in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+_active_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("active_query_logs", default=())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    for log in _active_logs.get():
+        log.statements.append(statement)
+
+
+def watch_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def query_log() -> Iterator[QueryLog]:
+    log = QueryLog()
+    token = _active_logs.set((*_active_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+class query_budget:
+    # Raises QueryBudgetExceeded when more than max_statements run inside it. Use as `with query_budget(3):`
+    # (awaits inside the block count too) or as a decorator on sync and async functions.
+    def __init__(self, max_statements: int, label: str | None = None):
+        self.max_statements = max_statements
+        self.label = label
+
+    def check(self, log: QueryLog, label: str | None = None) -> None:
+        if len(log) > self.max_statements:
+            lines = "\n".join(f"  {count}x {shape}" for shape, count in Counter(map(statement_shape, log.statements)).most_common())
+            raise QueryBudgetExceeded(f"{label or self.label or 'block'} ran {len(log)} statements, budget is {self.max_statements}:\n{lines}")
+
+    @contextmanager
+    def _watch(self, label: str | None) -> Iterator[QueryLog]:
+        with query_log() as log:
+            yield log
+        self.check(log, label)
+
+    def __enter__(self) -> QueryLog:
+        self._context = self._watch(self.label)
+        return self._context.__enter__()
+
+    def __exit__(self, *exc_info: Any) -> bool | None:
+        return self._context.__exit__(*exc_info)
+
+    def __call__(self, fn: F) -> F:
+        label = self.label or fn.__qualname__
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self._watch(label):
+                    return await fn(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self._watch(label):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+
+
+class QueryWatchMiddleware:
+    # Staging aid: logs requests that repeat one statement shape (the usual N+1 signature) or go over
+    # their route's budget. Never fails a request.
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 5):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with query_log() as log:
+            await self.app(scope, receive, send)
+        route = getattr(scope.get("route"), "path", scope["path"])
+        endpoint = f"{scope['method']} {route}"
+        for shape, count in log.repeated(self.repeat_threshold):
+            logger.warning("Possible N+1 in %s: %d executions of %s", endpoint, count, shape)
+        budget = ROUTE_BUDGETS.get((scope["method"], route))
+        if budget is not None and len(log) > budget:
+            logger.warning("%s ran %d statements, budget is %d", endpoint, len(log), budget)
@@ -0,0 +1,171 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Tighter buckets for routes that are expensive per call, by (method, route template): (tokens per
+# second, burst). They apply on top of the per-user bucket.
+ROUTE_LIMITS: dict[tuple[str, str], tuple[float, int]] = {
+    ("GET", "/projects/{project_id}/tasks/"): (10.0, 40),
+    ("GET", "/projects/{project_id}/export"): (0.2, 2),
+    ("POST", "/projects/{project_id}/tasks/bulk"): (1.0, 5),
+    ("PATCH", "/projects/{project_id}/tasks/bulk"): (1.0, 5),
+    ("POST", "/projects/{project_id}/tasks/import"): (0.2, 2),
+    ("GET", "/search/"): (5.0, 20),
+    ("GET", "/sync/"): (5.0, 20),
+}
+
+
+class RateLimitBackend(ABC):
+    # take() spends one token from the bucket at key and returns 0 when allowed, otherwise the seconds
+    # until a token is available. A missing bucket starts full.
+    @abstractmethod
+    async def take(self, key: str, rate: float, burst: int) -> float: ...
+
+
+class MemoryRateLimiter(RateLimitBackend):
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_entries:
+            # The oldest bucket has been idle longest and has almost certainly refilled.
+            self._buckets.popitem(last=False)
+        return wait
+
+
+_TAKE_SCRIPT = """
+local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated, 0) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(RateLimitBackend):
+    # Buckets shared by every worker; the refill and spend run as one script so concurrent takes can't
+    # both spend the last token. If Redis is unreachable requests are let through rather than failed.
+    def __init__(self, url: str):
+        try:
+            from redis.asyncio import Redis
+            from redis.exceptions import RedisError
+        except ImportError as exc:
+            raise RuntimeError("The 'redis' package is required for redis:// rate limit URLs") from exc
+        self._client = Redis.from_url(url)
+        self._script = self._client.register_script(_TAKE_SCRIPT)
+        self._errors = (RedisError, OSError)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        try:
+            return float(await self._script(keys=[key], args=[rate, burst, time.time()]))
+        except self._errors:
+            return 0.0
+
+
+def create_rate_limit_backend(url: str | None, max_entries: int = 100_000) -> RateLimitBackend:
+    if not url or url == "memory://":
+        return MemoryRateLimiter(max_entries)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisRateLimiter(url)
+    raise ValueError(f"Unsupported rate limit URL: {url}")
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+@dataclass
+class SheddingStats:
+    in_flight: int = 0
+    shed_in_flight: int = 0
+    shed_pool_wait: int = 0
+
+
+class LoadSheddingMiddleware:
+    # Rejects new requests with an immediate 503 while too many are already in flight or the database
+    # pool is exhausted and checkouts have been waiting too long, so a backlog drains instead of every
+    # request queueing for a connection until it times out. Health and metrics routes are never shed.
+    def __init__(self, app: ASGIApp, max_in_flight: int = 0, pool_wait: Callable[[], float] | None = None, max_pool_wait: float = 0.0, exempt: tuple[str, ...] = ("/healthz", "/metrics"), stats: SheddingStats | None = None):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.pool_wait = pool_wait
+        self.max_pool_wait = max_pool_wait
+        self.exempt = exempt
+        self.stats = stats if stats is not None else SheddingStats()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+        stats = self.stats
+        if self.max_in_flight and stats.in_flight >= self.max_in_flight:
+            stats.shed_in_flight += 1
+            await _reject(send, "1")
+            return
+        if self.max_pool_wait and self.pool_wait is not None:
+            waited = self.pool_wait()
+            if waited > self.max_pool_wait:
+                stats.shed_pool_wait += 1
+                await _reject(send, retry_after(waited))
+                return
+        # Counted until the response starts, so long-lived streams (e.g. the events feed) don't hold a slot.
+        stats.in_flight += 1
+        counted = True
+
+        def release() -> None:
+            nonlocal counted
+            if counted:
+                counted = False
+                stats.in_flight -= 1
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
+
+
+async def _reject(send: Send, retry: str) -> None:
+    body = b'{"detail":"Server is overloaded, retry later"}'
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", retry.encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+rate_limiter = create_rate_limit_backend(settings.RATE_LIMIT_URL, settings.RATE_LIMIT_MAX_ENTRIES)
+# The app's shedding middleware counts here, so /metrics can report it.
+shedding_stats = SheddingStats()
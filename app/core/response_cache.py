@@ -0,0 +1,127 @@
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, CacheStats, MemoryCache, create_cache_backend
+from app.core.config import settings
+from app.core.etag import check_not_modified
+
+class ResponseCache:
+    # Entries are stored under the current version of each of their tags. Invalidating a tag gives it a
+    # new version, so every entry cached under the old one stops being reachable and simply ages out.
+    def __init__(self, local: CacheBackend, shared: CacheBackend | None, ttl: float):
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+        self.tag_ttl = max(ttl * 10, 3600.0)
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def _tags(self) -> CacheBackend:
+        # Tag versions must be shared for invalidations to reach other processes.
+        return self.shared or self.local
+
+    async def _tag_version(self, tag: str) -> str:
+        version = await self._tags.get(f"tag:{tag}")
+        if version is None:
+            # An unknown or evicted tag starts at a fresh version, never at one older entries were stored under.
+            version = uuid.uuid4().hex[:12].encode()
+            await self._tags.set(f"tag:{tag}", version, self.tag_ttl)
+        return version.decode()
+
+    async def key(self, base: str, tags: Sequence[str]) -> str:
+        versions = [await self._tag_version(tag) for tag in tags]
+        return f"resp:{base}|{'.'.join(versions)}"
+
+    async def get(self, key: str) -> bytes | None:
+        if not self.enabled:
+            return None
+        value = await self.local.get(key)
+        if value is None and self.shared is not None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value, self.ttl)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def load(self, key: str, loader: Callable[[], Awaitable[bytes]], store: bool = True) -> bytes:
+        # Concurrent misses for the same key wait for one loader instead of each querying the database.
+        # With store=False the value is shared with those waiters but not cached.
+        while (pending := self._inflight.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The loading request went away; take over.
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            if self.enabled and store:
+                await self.local.set(key, value, self.ttl)
+                if self.shared is not None:
+                    await self.shared.set(key, value, self.ttl)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            await self._tags.set(f"tag:{tag}", uuid.uuid4().hex[:12].encode(), self.tag_ttl)
+
+response_cache = ResponseCache(
+    MemoryCache(settings.RESPONSE_CACHE_MAX_ENTRIES),
+    create_cache_backend(settings.RESPONSE_CACHE_URL) if settings.RESPONSE_CACHE_URL else None,
+    settings.response_cache_ttl,
+)
+
+def request_cache_key(request: Request, scope: str) -> str:
+    # Path (with its path parameters), sorted query string and the caller's visibility scope.
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}#{scope}"
+
+def pack(body: BaseModel | bytes, etag: str | None = None) -> bytes:
+    if isinstance(body, BaseModel):
+        body = body.model_dump_json().encode()
+    return (etag or "").encode() + b"\n" + body
+
+def packed_response(packed: bytes, if_none_match: str | None = None) -> Response:
+    etag, _, body = packed.partition(b"\n")
+    if not etag:
+        return Response(content=body, media_type="application/json")
+    check_not_modified(if_none_match, etag.decode())
+    return Response(content=body, media_type="application/json", headers={"ETag": etag.decode()})
+
+def project_tasks_tag(project_id: int) -> str:
+    return f"project:{project_id}:tasks"
+
+def task_tag(task_id: int) -> str:
+    return f"task:{task_id}"
+
+def task_comments_tag(task_id: int) -> str:
+    return f"task:{task_id}:comments"
+
+def owner_projects_tag(owner_id: int) -> str:
+    return f"projects:owner:{owner_id}"
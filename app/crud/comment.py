@@ -1,23 +1,35 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from sqlalchemy.sql import Select
-from collections.abc import Sequence
+from app.db.models.task import Task
 from app.db.models.task_comment import TaskComment
-from app.schemas.comment import CommentCreate
-from typing import Tuple
+from app.schemas.comment import CommentCreate, CommentOut
+from app.crud.pagination import SortKey, paginate, DEFAULT_PAGE_SIZE
+from typing import Any, Tuple
+from app.core.response_cache import response_cache, task_comments_tag
+from app.core.events import change_feed
 
-async def get_comments_by_task(db: AsyncSession, task_id: int) -> Sequence[TaskComment]:
+COMMENT_PAGE_KEYS = (SortKey(TaskComment.created_at), SortKey(TaskComment.id))
+COMMENT_OUT_COLUMNS = tuple(getattr(TaskComment, name) for name in CommentOut.model_fields)
+
+async def get_comments_by_task(db: AsyncSession, task_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> tuple[list[TaskComment], str | None]:
     stmt: Select[Tuple[TaskComment]] = select(TaskComment).where(TaskComment.task_id == task_id)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await paginate(db, stmt, COMMENT_PAGE_KEYS, limit, cursor)
+
+async def get_comment_rows_by_task(db: AsyncSession, task_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> tuple[list[Any], str | None]:
+    stmt = select(*COMMENT_OUT_COLUMNS).where(TaskComment.task_id == task_id)
+    return await paginate(db, stmt, COMMENT_PAGE_KEYS, limit, cursor, scalars=False)
 
 async def create_comment(db: AsyncSession, task_id: int, user_id: int, comment_data: CommentCreate) -> TaskComment:
-    comment = TaskComment(
+    stmt = insert(TaskComment).values(
         task_id=task_id,
         user_id=user_id,
         comment_text=comment_data.comment_text
-    )
-    db.add(comment)
+    ).returning(TaskComment)
+    comment = (await db.scalars(stmt)).one()
+    project_id = await db.scalar(select(Task.project_id).where(Task.id == task_id)) if change_feed.active else None
     await db.commit()
-    await db.refresh(comment)
+    await response_cache.invalidate(task_comments_tag(task_id))
+    if project_id is not None:
+        change_feed.publish(project_id, {"type": "comment.created", "id": comment.id, "task_id": task_id, "data": CommentOut.model_validate(comment).model_dump(mode="json")})
     return comment
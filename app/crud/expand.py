@@ -0,0 +1,126 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.db.models.project import Project
+from app.db.models.task import Task
+from app.db.models.task_comment import TaskComment
+from app.db.models.user import User
+
+MAX_INCLUDE_DEPTH = 3
+
+# Relationships that ?include= may expand, per model. User is a leaf: nothing hangs off it.
+EXPANDABLE: dict[type, tuple[str, ...]] = {
+    Project: ("owner", "tasks"),
+    Task: ("assignee", "comments"),
+    TaskComment: ("user",),
+    User: (),
+}
+
+# One-to-many relationships are capped per parent when included, so one project with thousands of tasks
+# can't turn a page into an unbounded response. A parent that has more gets "<name>_truncated": true;
+# the full list comes from that relationship's own paginated endpoint.
+INCLUDE_LIMITS: dict[tuple[type, str], int] = {
+    (Project, "tasks"): 100,
+    (Task, "comments"): 100,
+}
+
+IncludeTree = dict[str, "IncludeTree"]
+# Ids of the parents whose capped relationship was cut short, per (model, relationship).
+Truncated = dict[tuple[type, str], set[int]]
+
+class InvalidInclude(ValueError):
+    pass
+
+def parse_include(model: type, include: str | None) -> IncludeTree:
+    tree: IncludeTree = {}
+    if not include:
+        return tree
+    for path in filter(None, (p.strip() for p in include.split(","))):
+        names = path.split(".")
+        if len(names) > MAX_INCLUDE_DEPTH:
+            raise InvalidInclude(f"'{path}' is nested deeper than {MAX_INCLUDE_DEPTH} levels")
+        current_model, node = model, tree
+        for name in names:
+            if name not in EXPANDABLE[current_model]:
+                raise InvalidInclude(f"'{path}' cannot be included; '{name}' is not expandable on {current_model.__name__}")
+            current_model = getattr(current_model, name).property.mapper.class_
+            node = node.setdefault(name, {})
+    return tree
+
+def include_options(model: type, tree: IncludeTree, parent: Any = None) -> list[Any]:
+    # One selectinload per relationship path: a fixed number of batched IN queries however many rows come back.
+    # Capped relationships, and everything below them, are left to load_limited.
+    options = []
+    for name, children in tree.items():
+        if (model, name) in INCLUDE_LIMITS:
+            continue
+        attr = getattr(model, name)
+        loader = parent.selectinload(attr) if parent is not None else selectinload(attr)
+        if children:
+            options.extend(include_options(attr.property.mapper.class_, children, loader))
+        else:
+            options.append(loader)
+    return options
+
+async def load_limited(db: AsyncSession, model: type, objects: Sequence[Any], tree: IncludeTree, truncated: Truncated | None = None) -> Truncated:
+    # Loads what include_options skipped: for each capped relationship, the first `limit` children of every
+    # parent by id, picked with a window function in one query (plus the usual options below them).
+    truncated = {} if truncated is None else truncated
+    for name, children in tree.items():
+        if not objects:
+            break
+        limit = INCLUDE_LIMITS.get((model, name))
+        if limit is None:
+            # Already loaded; look further down for capped relationships.
+            values = [getattr(obj, name) for obj in objects]
+            related = [item for value in values if value is not None for item in (value if isinstance(value, list) else [value])]
+            if children:
+                await load_limited(db, getattr(model, name).property.mapper.class_, related, children, truncated)
+            continue
+        relationship = getattr(model, name).property
+        [(local, remote)] = relationship.local_remote_pairs
+        target = relationship.mapper.class_
+        keys = [getattr(obj, local.key) for obj in objects]
+        ranked = (
+            select(target.id, func.row_number().over(partition_by=remote, order_by=target.id).label("rank"))
+            .where(remote.in_(keys))
+            .subquery()
+        )
+        stmt = (
+            select(target)
+            .join(ranked, target.id == ranked.c.id)
+            .where(ranked.c.rank <= limit + 1)
+            .order_by(target.id)
+            .options(*include_options(target, children))
+        )
+        grouped: defaultdict[Any, list[Any]] = defaultdict(list)
+        for row in (await db.scalars(stmt)).all():
+            grouped[getattr(row, remote.key)].append(row)
+        kept = []
+        for obj, key in zip(objects, keys):
+            items = grouped.get(key, [])
+            if len(items) > limit:
+                truncated.setdefault((model, name), set()).add(obj.id)
+            set_committed_value(obj, name, items[:limit])
+            kept.extend(items[:limit])
+        await load_limited(db, target, kept, children, truncated)
+    return truncated
+
+def expand(obj: Any, tree: IncludeTree, truncated: Truncated | None = None) -> dict[str, Any]:
+    # Plain column values plus only the requested relationships, so unrequested ones stay unset in the output.
+    data = {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+    for name, children in tree.items():
+        value = getattr(obj, name)
+        if value is None:
+            data[name] = None
+        elif isinstance(value, list):
+            data[name] = [expand(item, children, truncated) for item in sorted(value, key=lambda item: item.id)]
+        else:
+            data[name] = expand(value, children, truncated)
+        if truncated and obj.id in truncated.get((type(obj), name), ()):
+            data[f"{name}_truncated"] = True
+    return data
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.task import Task
+from app.db.models.task_comment import TaskComment
+
+EXPORT_BATCH_SIZE = 1000
+TASK_EXPORT_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.priority,
+    Task.assigned_to, Task.due_date, Task.created_at, Task.updated_at,
+)
+COMMENT_EXPORT_COLUMNS = (
+    TaskComment.id.label("comment_id"),
+    TaskComment.user_id.label("comment_user_id"),
+    TaskComment.comment_text,
+    TaskComment.created_at.label("comment_created_at"),
+)
+TASK_FIELDS = [c.key for c in TASK_EXPORT_COLUMNS]
+CSV_HEADER = [*TASK_FIELDS, *(c.key for c in COMMENT_EXPORT_COLUMNS)]
+
+def project_export_query(project_id: int) -> Any:
+    # One row per task/comment pair; the order matches ix_tasks_project_id_created_at_id and
+    # ix_task_comments_task_id_created_at_id so the database can stream without sorting.
+    return (
+        select(*TASK_EXPORT_COLUMNS, *COMMENT_EXPORT_COLUMNS)
+        .outerjoin(TaskComment, TaskComment.task_id == Task.id)
+        .where(Task.project_id == project_id)
+        .order_by(Task.created_at, Task.id, TaskComment.created_at, TaskComment.id)
+    )
+
+async def stream_project_rows(db: AsyncSession, project_id: int, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[Sequence[Row[Any]]]:
+    result = await db.stream(project_export_query(project_id).execution_options(yield_per=batch_size))
+    async for batch in result.partitions():
+        yield batch
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def ndjson_export(batches: AsyncIterator[Sequence[Row[Any]]]) -> AsyncIterator[bytes]:
+    # One line per task with its comments nested; a task whose comments span batches is carried over.
+    current: dict[str, Any] | None = None
+    async for batch in batches:
+        lines = []
+        for row in batch:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    lines.append(json.dumps(current, separators=(",", ":")))
+                current = {field: _plain(getattr(row, field)) for field in TASK_FIELDS}
+                current["comments"] = []
+            if row.comment_id is not None:
+                current["comments"].append({
+                    "id": row.comment_id,
+                    "user_id": row.comment_user_id,
+                    "comment_text": row.comment_text,
+                    "created_at": _plain(row.comment_created_at),
+                })
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+    if current is not None:
+        yield (json.dumps(current, separators=(",", ":")) + "\n").encode()
+
+async def csv_export(batches: AsyncIterator[Sequence[Row[Any]]]) -> AsyncIterator[bytes]:
+    # Flat join rows: task columns repeat for each comment, comment columns are empty for tasks without any.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    async for batch in batches:
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_export, "application/x-ndjson"),
+    "csv": (csv_export, "text/csv"),
+}
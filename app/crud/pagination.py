@@ -0,0 +1,133 @@
+import base64
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import and_, false, literal, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SortKey:
+    column: Any
+    descending: bool = False
+    nullable: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.column.key
+
+    @property
+    def signature(self) -> str:
+        return f"-{self.name}" if self.descending else self.name
+
+
+def keys_signature(keys: Sequence[SortKey]) -> str:
+    return ",".join(k.signature for k in keys)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(keys: Sequence[SortKey], values: Sequence[Any]) -> str:
+    payload = [keys_signature(keys), *(_encode_value(v) for v in values)]
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not isinstance(payload, list) or len(payload) != len(keys) + 1 or payload[0] != keys_signature(keys):
+        raise InvalidCursor("Cursor does not match the requested ordering")
+    try:
+        return [_decode_value(v) for v in payload[1:]]
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def _after(key: SortKey, value: Any) -> ColumnElement[bool]:
+    # NULLs always sort last, so nothing comes after a NULL except ties.
+    if value is None:
+        return false()
+    cond = key.column < value if key.descending else key.column > value
+    if key.nullable:
+        cond = or_(cond, key.column.is_(None))
+    return cond
+
+
+def _equal(key: SortKey, value: Any) -> ColumnElement[bool]:
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    directions = {k.descending for k in keys}
+    if len(directions) == 1 and not any(k.nullable for k in keys):
+        # Row-value comparison lets the planner turn the page into a single index range scan.
+        row = tuple_(*(k.column for k in keys))
+        bound = tuple_(*(literal(v, type_=k.column.type) for k, v in zip(keys, values)))
+        return row < bound if keys[0].descending else row > bound
+    clauses = []
+    for i, key in enumerate(keys):
+        prefix = [_equal(k, v) for k, v in zip(keys[:i], values[:i])]
+        clauses.append(and_(*prefix, _after(key, values[i])))
+    return or_(*clauses)
+
+
+def order_by_keys(keys: Sequence[SortKey]) -> list[Any]:
+    ordering = []
+    for key in keys:
+        col = key.column.desc() if key.descending else key.column.asc()
+        ordering.append(col.nulls_last() if key.nullable else col)
+    return ordering
+
+
+def apply_keyset(stmt: Select[Any], keys: Sequence[SortKey], limit: int, cursor: str | None) -> Select[Any]:
+    if cursor is not None:
+        stmt = stmt.where(keyset_condition(keys, decode_cursor(cursor, keys)))
+    return stmt.order_by(*order_by_keys(keys)).limit(limit + 1)
+
+
+def next_cursor(rows: list[Any], keys: Sequence[SortKey], limit: int) -> str | None:
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(keys, [getattr(rows[-1], k.name) for k in keys])
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select[Any],
+    keys: Sequence[SortKey],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    scalars: bool = True,
+) -> tuple[list[Any], str | None]:
+    result = await db.execute(apply_keyset(stmt, keys, limit, cursor))
+    rows = list(result.scalars().all() if scalars else result.all())
+    return rows, next_cursor(rows, keys, limit)
@@ -1,36 +1,84 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.sql import ColumnElement, Select
+from typing import Any
 from collections.abc import Sequence
+from datetime import datetime
 from app.db.models.project import Project, ProjectStatus
+from app.db.models.task import Task
+from app.db.timestamps import timestamp_in
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.crud.pagination import SortKey, paginate, DEFAULT_PAGE_SIZE
+from app.core.response_cache import response_cache, owner_projects_tag
 
-async def get_projects(db: AsyncSession, owner_id: int) -> Sequence[Project]:
-    result = await db.execute(select(Project).where(Project.owner_id == owner_id))
-    return result.scalars().all()
+PROJECT_PAGE_KEYS = (SortKey(Project.created_at), SortKey(Project.id))
 
-async def get_project(db: AsyncSession, project_id: int) -> Project | None:
-    result = await db.execute(select(Project).where(Project.id == project_id))
+async def get_projects(db: AsyncSession, owner_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None, options: Sequence[Any] = ()) -> tuple[list[Project], str | None]:
+    stmt = select(Project).where(Project.owner_id == owner_id).options(*options)
+    return await paginate(db, stmt, PROJECT_PAGE_KEYS, limit, cursor)
+
+async def get_project(db: AsyncSession, project_id: int, options: Sequence[Any] = ()) -> Project | None:
+    result = await db.execute(select(Project).where(Project.id == project_id).options(*options))
     return result.scalar_one_or_none()
 
+async def project_exists(db: AsyncSession, project_id: int) -> bool:
+    return await get_project_version(db, project_id) is not None
+
+async def get_project_version(db: AsyncSession, project_id: int) -> datetime | None:
+    result = await db.execute(select(Project.updated_at).where(Project.id == project_id))
+    return result.scalar_one_or_none()
+
+def visible_project_ids(user_id: int) -> Select[Any]:
+    # Projects a non-admin can see: the ones they own and the ones with a task assigned to them.
+    return select(Project.id).where(Project.owner_id == user_id).union(
+        select(Task.project_id).where(Task.assigned_to == user_id)
+    )
+
+def _project_scope(project_id: int, owner_id: int | None, versions: Sequence[datetime] | None = None) -> list[ColumnElement[bool]]:
+    conditions = [Project.id == project_id]
+    if owner_id is not None:
+        conditions.append(Project.owner_id == owner_id)
+    if versions is not None:
+        conditions.append(timestamp_in(Project.updated_at, versions))
+    return conditions
+
 async def create_project(db: AsyncSession, project_data: ProjectCreate, owner_id: int) -> Project:
-    project = Project(
+    stmt = insert(Project).values(
         name=project_data.name,
         description=project_data.description,
         owner_id=owner_id,
         status=ProjectStatus.active
-    )
-    db.add(project)
+    ).returning(Project)
+    project = (await db.scalars(stmt)).one()
     await db.commit()
-    await db.refresh(project)
+    await response_cache.invalidate(owner_projects_tag(owner_id))
     return project
 
-async def update_project(db: AsyncSession, project: Project, updates: ProjectUpdate) -> Project:
-    for field, value in updates.model_dump(exclude_unset=True).items():
-        setattr(project, field, value)
+async def update_project(db: AsyncSession, project_id: int, updates: ProjectUpdate, owner_id: int | None = None, versions: Sequence[datetime] | None = None) -> Project | None:
+    # With owner_id set, only a project owned by that user matches; with versions set (from If-Match), only a
+    # project still at one of those updated_at values. None means the row is missing or not allowed.
+    conditions = _project_scope(project_id, owner_id, versions)
+    changes = updates.model_dump(exclude_unset=True)
+    if not changes:
+        return (await db.scalars(select(Project).where(*conditions))).one_or_none()
+    stmt = (
+        update(Project)
+        .where(*conditions)
+        .values(**changes)
+        .returning(Project)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    project = (await db.scalars(stmt)).one_or_none()
     await db.commit()
-    await db.refresh(project)
+    if project is not None:
+        await response_cache.invalidate(owner_projects_tag(project.owner_id))
     return project
 
-async def delete_project(db: AsyncSession, project: Project):
-    await db.delete(project)
+async def delete_project(db: AsyncSession, project_id: int, owner_id: int | None = None) -> bool:
+    stmt = delete(Project).where(*_project_scope(project_id, owner_id)).returning(Project.owner_id)
+    deleted_owner = (await db.scalars(stmt)).one_or_none()
     await db.commit()
+    if deleted_owner is None:
+        return False
+    await response_cache.invalidate(owner_projects_tag(deleted_owner))
+    return True
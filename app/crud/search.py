@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, union_all, literal, literal_column, func
+from sqlalchemy.sql import ColumnElement, Select
+from typing import Any
+from app.db.models.task import Task
+from app.db.models.task_comment import TaskComment
+from app.db.search import SEARCH_CONFIG, task_search_vector, comment_search_vector, tasks_fts, task_comments_fts
+from app.crud.pagination import SortKey, paginate, DEFAULT_PAGE_SIZE
+from app.crud.project import visible_project_ids
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input can't use FTS5 operators; adjacent terms are ANDed.
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+def _postgresql_hits(q: str) -> tuple[Select[Any], Select[Any]]:
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    tasks = select(func.ts_rank_cd(task_search_vector, query).label("rank")).where(task_search_vector.op("@@")(query))
+    comments = select(func.ts_rank_cd(comment_search_vector, query).label("rank")).where(comment_search_vector.op("@@")(query))
+    return tasks.select_from(Task), comments.select_from(TaskComment)
+
+def _fts5_hits(fts: Any, model: Any, query: str) -> Select[Any]:
+    fts_table = literal_column(fts.name)
+    # bm25() is lower-is-better; negate it so both backends rank descending.
+    return (
+        select((-func.bm25(fts_table)).label("rank"))
+        .select_from(model)
+        .join(fts, fts.c.rowid == model.id)
+        .where(fts_table.op("MATCH")(query))
+    )
+
+def _sqlite_hits(q: str) -> tuple[Select[Any], Select[Any]]:
+    query = _fts5_query(q)
+    return _fts5_hits(tasks_fts, Task, query), _fts5_hits(task_comments_fts, TaskComment, query)
+
+async def search(db: AsyncSession, q: str, user_id: int | None = None, project_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> tuple[list[Any], str | None]:
+    # user_id=None searches every project (admins); otherwise only the projects visible to that user.
+    hits = _postgresql_hits if db.bind.dialect.name == "postgresql" else _sqlite_hits
+    tasks, comments = hits(q)
+    tasks = tasks.add_columns(
+        literal("task").label("kind"), Task.id, Task.id.label("task_id"), Task.project_id, Task.title, Task.description.label("text"),
+    )
+    comments = comments.join(Task, Task.id == TaskComment.task_id).add_columns(
+        literal("comment").label("kind"), TaskComment.id, TaskComment.task_id, Task.project_id, Task.title, TaskComment.comment_text.label("text"),
+    )
+    conditions: list[ColumnElement[bool]] = []
+    if user_id is not None:
+        conditions.append(Task.project_id.in_(visible_project_ids(user_id)))
+    if project_id is not None:
+        conditions.append(Task.project_id == project_id)
+    hits_query = union_all(tasks.where(*conditions), comments.where(*conditions)).subquery("hits")
+    keys = (SortKey(hits_query.c.rank, descending=True), SortKey(hits_query.c.kind, descending=True), SortKey(hits_query.c.id, descending=True))
+    return await paginate(db, select(hits_query), keys, limit, cursor, scalars=False)
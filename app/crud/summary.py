@@ -0,0 +1,124 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, func, case, text
+from sqlalchemy.sql import ColumnElement, Select
+from collections.abc import Sequence
+from typing import Any
+from app.db.models.project import Project
+from app.db.models.project_summary import ProjectSummary
+from app.db.models.task import Task, TaskStatus, TaskPriority
+from app.db.models.task_comment import TaskComment
+
+STATUS_COUNTS = {status: f"{status.value}_count" for status in TaskStatus}
+PRIORITY_COUNTS = {priority: f"{priority.value}_count" for priority in TaskPriority}
+SUMMARY_COUNTS = (*STATUS_COUNTS.values(), *PRIORITY_COUNTS.values(), "comment_count")
+
+def summaries_maintained(db: AsyncSession) -> bool:
+    # The summary table is kept current by triggers (see the project_summaries migration),
+    # which only exist on PostgreSQL; elsewhere counts are aggregated at read time.
+    return db.bind.dialect.name == "postgresql"
+
+def _task_count_conditions() -> dict[str, ColumnElement[bool]]:
+    conditions = {name: Task.status == status for status, name in STATUS_COUNTS.items()}
+    conditions.update({name: Task.priority == priority for priority, name in PRIORITY_COUNTS.items()})
+    return conditions
+
+def computed_summaries(project_ids: Sequence[int] | None = None) -> Select[Any]:
+    task_counts = select(
+        Task.project_id,
+        *(func.sum(case((cond, 1), else_=0)).label(name) for name, cond in _task_count_conditions().items()),
+    ).group_by(Task.project_id)
+    comment_counts = (
+        select(Task.project_id, func.count(TaskComment.id).label("comment_count"))
+        .join(TaskComment, TaskComment.task_id == Task.id)
+        .group_by(Task.project_id)
+    )
+    stmt = select(Project.id.label("project_id"))
+    if project_ids is not None:
+        task_counts = task_counts.where(Task.project_id.in_(project_ids))
+        comment_counts = comment_counts.where(Task.project_id.in_(project_ids))
+        stmt = stmt.where(Project.id.in_(project_ids))
+    t = task_counts.subquery()
+    c = comment_counts.subquery()
+    return (
+        stmt.add_columns(
+            *(func.coalesce(t.c[name], 0).label(name) for name in _task_count_conditions()),
+            func.coalesce(c.c.comment_count, 0).label("comment_count"),
+        )
+        .outerjoin(t, t.c.project_id == Project.id)
+        .outerjoin(c, c.c.project_id == Project.id)
+    )
+
+async def _overdue_counts(db: AsyncSession, project_ids: Sequence[int]) -> dict[int, int]:
+    # Depends on the current time, so it cannot be maintained by triggers; ix_tasks_project_id_open_due_date covers it.
+    stmt = (
+        select(Task.project_id, func.count())
+        .where(
+            Task.project_id.in_(project_ids),
+            Task.due_date.is_not(None),
+            Task.status != TaskStatus.done,
+            Task.due_date < func.now(),
+        )
+        .group_by(Task.project_id)
+    )
+    return {project_id: count for project_id, count in (await db.execute(stmt)).all()}
+
+async def _stored_counts(db: AsyncSession, project_ids: Sequence[int]) -> dict[int, dict[str, int]]:
+    if summaries_maintained(db):
+        columns = [getattr(ProjectSummary, name) for name in SUMMARY_COUNTS]
+        stmt = select(ProjectSummary.project_id, *columns).where(ProjectSummary.project_id.in_(project_ids))
+    else:
+        stmt = computed_summaries(project_ids)
+    result = await db.execute(stmt)
+    return {row.project_id: {name: getattr(row, name) for name in SUMMARY_COUNTS} for row in result}
+
+async def get_project_summaries(db: AsyncSession, project_ids: Sequence[int]) -> dict[int, dict[str, Any]]:
+    if not project_ids:
+        return {}
+    counts = await _stored_counts(db, project_ids)
+    overdue = await _overdue_counts(db, project_ids)
+    summaries = {}
+    for project_id in project_ids:
+        row = counts.get(project_id) or dict.fromkeys(SUMMARY_COUNTS, 0)
+        by_status = {status.value: row[name] for status, name in STATUS_COUNTS.items()}
+        summaries[project_id] = {
+            "project_id": project_id,
+            "tasks_by_status": by_status,
+            "tasks_by_priority": {priority.value: row[name] for priority, name in PRIORITY_COUNTS.items()},
+            "total_tasks": sum(by_status.values()),
+            "overdue_count": overdue.get(project_id, 0),
+            "comment_count": row["comment_count"],
+        }
+    return summaries
+
+async def get_project_summary(db: AsyncSession, project_id: int) -> dict[str, Any]:
+    return (await get_project_summaries(db, [project_id]))[project_id]
+
+async def find_summary_drift(db: AsyncSession, project_ids: Sequence[int] | None = None) -> list[int]:
+    stored_stmt = select(ProjectSummary)
+    if project_ids is not None:
+        stored_stmt = stored_stmt.where(ProjectSummary.project_id.in_(project_ids))
+    stored = {
+        s.project_id: {name: getattr(s, name) for name in SUMMARY_COUNTS}
+        for s in (await db.scalars(stored_stmt)).all()
+    }
+    drifted = []
+    for row in await db.execute(computed_summaries(project_ids)):
+        expected = {name: getattr(row, name) for name in SUMMARY_COUNTS}
+        if stored.pop(row.project_id, None) != expected:
+            drifted.append(row.project_id)
+    # Whatever is left has no project behind it any more.
+    drifted.extend(stored)
+    return sorted(drifted)
+
+async def rebuild_project_summaries(db: AsyncSession, project_ids: Sequence[int] | None = None) -> int:
+    if db.bind.dialect.name == "postgresql":
+        # Hold off task/comment writers so their trigger deltas cannot interleave with the recount.
+        await db.execute(text("LOCK TABLE tasks, task_comments IN SHARE MODE"))
+    stmt = delete(ProjectSummary)
+    if project_ids is not None:
+        stmt = stmt.where(ProjectSummary.project_id.in_(project_ids))
+    await db.execute(stmt)
+    columns = ["project_id", *SUMMARY_COUNTS]
+    result = await db.execute(insert(ProjectSummary).from_select(columns, computed_summaries(project_ids)))
+    await db.commit()
+    return result.rowcount
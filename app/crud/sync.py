@@ -0,0 +1,45 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, union_all, literal
+from typing import Any
+from app.db.models.project import Project
+from app.db.models.task import Task
+from app.db.models.task_comment import TaskComment
+from app.db.models.tombstone import Tombstone
+from app.db.changes import change_watermark
+from app.crud.pagination import SortKey, paginate, encode_cursor, DEFAULT_PAGE_SIZE
+from app.crud.project import visible_project_ids
+
+SYNC_KINDS = {"project": Project, "task": Task, "comment": TaskComment, "tombstone": Tombstone}
+
+def _changes(user_id: int | None, include_tombstones: bool) -> Any:
+    projects = select(Project.change_seq, literal("project").label("kind"), Project.id)
+    tasks = select(Task.change_seq, literal("task").label("kind"), Task.id)
+    comments = select(TaskComment.change_seq, literal("comment").label("kind"), TaskComment.id).join(Task, Task.id == TaskComment.task_id)
+    tombstones = select(Tombstone.change_seq, literal("tombstone").label("kind"), Tombstone.id)
+    if user_id is not None:
+        visible = visible_project_ids(user_id)
+        projects = projects.where(Project.id.in_(visible))
+        tasks = tasks.where(Task.project_id.in_(visible))
+        comments = comments.where(Task.project_id.in_(visible))
+        # A deleted project or task no longer makes its project visible, so owners and assignees match directly.
+        tombstones = tombstones.where((Tombstone.project_id.in_(visible)) | (Tombstone.user_id == user_id))
+    parts = [projects, tasks, comments] + ([tombstones] if include_tombstones else [])
+    return union_all(*parts).subquery("changes")
+
+async def get_changes(db: AsyncSession, since: str | None = None, user_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE) -> tuple[dict[str, list[Any]], str, bool]:
+    # since=None is the initial sync: every live row, no tombstones. The token is a keyset position over
+    # (change_seq, kind, id); a fully drained feed ends on the watermark so the next call starts there.
+    watermark = (await db.execute(change_watermark(db.bind.dialect.name))).scalar_one()
+    changes = _changes(user_id, include_tombstones=since is not None)
+    keys = (SortKey(changes.c.change_seq), SortKey(changes.c.kind), SortKey(changes.c.id))
+    stmt = select(changes).where(changes.c.change_seq < watermark)
+    rows, next_cursor = await paginate(db, stmt, keys, limit, since, scalars=False)
+
+    loaded: dict[str, list[Any]] = {kind: [] for kind in SYNC_KINDS}
+    for kind, model in SYNC_KINDS.items():
+        kind_ids = [row.id for row in rows if row.kind == kind]
+        if kind_ids:
+            loaded[kind] = list(await db.scalars(select(model).where(model.id.in_(kind_ids)).order_by(model.change_seq, model.id)))
+    has_more = next_cursor is not None
+    token = next_cursor if has_more else encode_cursor(keys, [watermark, "", 0])
+    return loaded, token, has_more
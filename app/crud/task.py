@@ -1,43 +1,221 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete
+from typing import Any
 from collections.abc import Sequence
+from datetime import datetime
+from sqlalchemy.sql import ColumnElement
 from app.db.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.db.timestamps import timestamp_in
+from app.schemas.task import TaskCreate, TaskUpdate, TaskFilter, TaskOut
+from app.crud.pagination import SortKey, paginate, DEFAULT_PAGE_SIZE
+from app.core.response_cache import response_cache, project_tasks_tag, task_tag
+from app.core.events import change_feed
 
-async def get_tasks_by_project(db: AsyncSession, project_id: int) -> Sequence[Task]:
-    result = await db.execute(select(Task).where(Task.project_id == project_id))
-    return result.scalars().all()
+TASK_SORT_FIELDS = {
+    "created_at": (Task.created_at, False),
+    "updated_at": (Task.updated_at, False),
+    "due_date": (Task.due_date, True),
+    "priority": (Task.priority, False),
+    "status": (Task.status, False),
+    "title": (Task.title, False),
+}
+TASK_SORT_PATTERN = "^-?(" + "|".join(TASK_SORT_FIELDS) + ")$"
+DEFAULT_TASK_SORT = "created_at"
+# Columns in TaskOut field order, for list reads that skip ORM hydration and pydantic validation.
+TASK_OUT_COLUMNS = tuple(getattr(Task, name) for name in TaskOut.model_fields)
 
-async def get_task(db: AsyncSession, task_id: int) -> Task | None:
-    result = await db.execute(select(Task).where(Task.id == task_id))
+def task_sort_keys(sort: str = DEFAULT_TASK_SORT) -> tuple[SortKey, SortKey]:
+    descending = sort.startswith("-")
+    column, nullable = TASK_SORT_FIELDS[sort.lstrip("-")]
+    return SortKey(column, descending, nullable), SortKey(Task.id, descending)
+
+def task_filter_conditions(filters: TaskFilter) -> list[ColumnElement[bool]]:
+    conditions: list[ColumnElement[bool]] = []
+    if filters.status:
+        conditions.append(Task.status.in_(filters.status))
+    if filters.priority:
+        conditions.append(Task.priority.in_(filters.priority))
+    if filters.assigned_to is not None:
+        conditions.append(Task.assigned_to == filters.assigned_to)
+    if filters.due_before is not None:
+        conditions.append(Task.due_date < filters.due_before)
+    if filters.due_after is not None:
+        conditions.append(Task.due_date >= filters.due_after)
+    return conditions
+
+async def get_tasks_by_project(
+    db: AsyncSession,
+    project_id: int,
+    filters: TaskFilter | None = None,
+    sort: str = DEFAULT_TASK_SORT,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    options: Sequence[Any] = (),
+) -> tuple[list[Task], str | None]:
+    stmt = select(Task).where(Task.project_id == project_id).options(*options)
+    if filters is not None:
+        stmt = stmt.where(*task_filter_conditions(filters))
+    return await paginate(db, stmt, task_sort_keys(sort), limit, cursor)
+
+async def get_task_rows_by_project(
+    db: AsyncSession,
+    project_id: int,
+    filters: TaskFilter | None = None,
+    sort: str = DEFAULT_TASK_SORT,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[Any], str | None]:
+    # Same page as get_tasks_by_project, as plain Row tuples of TASK_OUT_COLUMNS.
+    stmt = select(*TASK_OUT_COLUMNS).where(Task.project_id == project_id)
+    if filters is not None:
+        stmt = stmt.where(*task_filter_conditions(filters))
+    return await paginate(db, stmt, task_sort_keys(sort), limit, cursor, scalars=False)
+
+async def get_task_page_versions(
+    db: AsyncSession,
+    project_id: int,
+    filters: TaskFilter | None = None,
+    sort: str = DEFAULT_TASK_SORT,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[Any], str | None]:
+    # The same page as get_tasks_by_project, but only the columns needed for its ETag and cursor.
+    keys = task_sort_keys(sort)
+    columns = {Task.id.key: Task.id, Task.updated_at.key: Task.updated_at, keys[0].name: keys[0].column}
+    stmt = select(*columns.values()).where(Task.project_id == project_id)
+    if filters is not None:
+        stmt = stmt.where(*task_filter_conditions(filters))
+    return await paginate(db, stmt, keys, limit, cursor, scalars=False)
+
+async def get_task(db: AsyncSession, task_id: int, options: Sequence[Any] = ()) -> Task | None:
+    result = await db.execute(select(Task).where(Task.id == task_id).options(*options))
     return result.scalar_one_or_none()
 
+async def task_exists(db: AsyncSession, task_id: int) -> bool:
+    return await get_task_version(db, task_id) is not None
+
+async def get_task_version(db: AsyncSession, task_id: int) -> datetime | None:
+    result = await db.execute(select(Task.updated_at).where(Task.id == task_id))
+    return result.scalar_one_or_none()
+
+def _task_scope(task_id: int, assignee_id: int | None, versions: Sequence[datetime] | None = None) -> list[ColumnElement[bool]]:
+    conditions = [Task.id == task_id]
+    if assignee_id is not None:
+        conditions.append(Task.assigned_to == assignee_id)
+    if versions is not None:
+        conditions.append(timestamp_in(Task.updated_at, versions))
+    return conditions
+
+def _publish_task(action: str, task: Task) -> None:
+    if change_feed.active:
+        change_feed.publish(task.project_id, {"type": f"task.{action}", "id": task.id, "data": TaskOut.model_validate(task).model_dump(mode="json")})
+
 async def create_task(db: AsyncSession, project_id: int, task_data: TaskCreate) -> Task:
-    task = Task(
+    stmt = insert(Task).values(
         title=task_data.title,
         description=task_data.description,
         priority=task_data.priority,
         due_date=task_data.due_date,
         project_id=project_id
-    )
-    db.add(task)
+    ).returning(Task)
+    task = (await db.scalars(stmt)).one()
     await db.commit()
-    await db.refresh(task)
+    await response_cache.invalidate(project_tasks_tag(project_id))
+    _publish_task("created", task)
     return task
 
-async def update_task(db: AsyncSession, task: Task, updates: TaskUpdate) -> Task:
-    for field, value in updates.model_dump(exclude_unset=True).items():
-        setattr(task, field, value)
+async def create_tasks(db: AsyncSession, project_id: int, tasks: Sequence[TaskCreate]) -> list[Task]:
+    if not tasks:
+        return []
+    rows = [
+        {
+            "title": task_data.title,
+            "description": task_data.description,
+            "priority": task_data.priority,
+            "due_date": task_data.due_date,
+            "project_id": project_id,
+        }
+        for task_data in tasks
+    ]
+    # Executemany with RETURNING is batched by SQLAlchemy into multi-row INSERT ... VALUES (...), (...) RETURNING statements.
+    stmt = insert(Task).returning(Task, sort_by_parameter_order=True).execution_options(render_nulls=True)
+    result = await db.scalars(stmt, rows)
+    created = list(result.all())
     await db.commit()
-    await db.refresh(task)
+    await response_cache.invalidate(project_tasks_tag(project_id))
+    # One event for the whole batch, like bulk updates and imports; clients load the rows they need.
+    change_feed.publish(project_id, {"type": "tasks.created", "data": {"ids": [task.id for task in created]}})
+    return created
+
+async def _update_task_columns(db: AsyncSession, conditions: list[ColumnElement[bool]], changes: dict[str, Any]) -> Task | None:
+    if not changes:
+        return (await db.scalars(select(Task).where(*conditions))).one_or_none()
+    stmt = (
+        update(Task)
+        .where(*conditions)
+        .values(**changes)
+        .returning(Task)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    task = (await db.scalars(stmt)).one_or_none()
+    await db.commit()
+    if task is not None:
+        await response_cache.invalidate(task_tag(task.id), project_tasks_tag(task.project_id))
+        _publish_task("updated", task)
     return task
 
-async def delete_task(db: AsyncSession, task: Task):
-    await db.delete(task)
+async def update_task(db: AsyncSession, task_id: int, updates: TaskUpdate, assignee_id: int | None = None, versions: Sequence[datetime] | None = None) -> Task | None:
+    # With assignee_id set, only a task assigned to that user matches; with versions set (from If-Match),
+    # only a task still at one of those updated_at values. None means the row is missing or not allowed.
+    return await _update_task_columns(db, _task_scope(task_id, assignee_id, versions), updates.model_dump(exclude_unset=True))
+
+async def delete_task(db: AsyncSession, task_id: int, assignee_id: int | None = None) -> bool:
+    stmt = delete(Task).where(*_task_scope(task_id, assignee_id)).returning(Task.project_id)
+    project_id = (await db.scalars(stmt)).one_or_none()
     await db.commit()
+    if project_id is None:
+        return False
+    await response_cache.invalidate(task_tag(task_id), project_tasks_tag(project_id))
+    change_feed.publish(project_id, {"type": "task.deleted", "id": task_id})
+    return True
 
-async def assign_task(db: AsyncSession, task: Task, user_id: int) -> Task:
-    task.assigned_to = user_id
+async def assign_task(db: AsyncSession, task_id: int, user_id: int, versions: Sequence[datetime] | None = None) -> Task | None:
+    return await _update_task_columns(db, _task_scope(task_id, None, versions), {"assigned_to": user_id})
+
+async def bulk_update_tasks(
+    db: AsyncSession,
+    project_id: int,
+    changes: dict[str, Any],
+    ids: Sequence[int] | None = None,
+    filters: TaskFilter | None = None,
+    assignee_id: int | None = None,
+) -> tuple[list[int], list[int]]:
+    target = [Task.project_id == project_id]
+    if ids is not None:
+        target.append(Task.id.in_(ids))
+    if filters is not None:
+        target.extend(task_filter_conditions(filters))
+    allowed = [Task.assigned_to == assignee_id] if assignee_id is not None else []
+
+    refused: list[int] = []
+    if ids is None and assignee_id is not None:
+        result = await db.scalars(select(Task.id).where(*target, Task.assigned_to.is_distinct_from(assignee_id)))
+        refused = list(result.all())
+
+    # Authorization lives in the WHERE clause; anything selected but not returned was refused.
+    stmt = (
+        update(Task)
+        .where(*target, *allowed)
+        .values(**changes)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = list((await db.scalars(stmt)).all())
+    if ids is not None:
+        changed = set(updated)
+        refused = [task_id for task_id in dict.fromkeys(ids) if task_id not in changed]
     await db.commit()
-    await db.refresh(task)
-    return task
+    if updated:
+        await response_cache.invalidate(project_tasks_tag(project_id), *(task_tag(task_id) for task_id in updated))
+        change_feed.publish(project_id, {"type": "tasks.updated", "data": {"ids": updated, "changes": changes}})
+    return updated, refused
@@ -0,0 +1,165 @@
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.task import Task, TaskStatus
+from app.schemas.task import TaskCreate, TaskBulkError
+from app.core.response_cache import response_cache, project_tasks_tag
+from app.core.events import change_feed
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_IMPORT_ERRORS = 1000
+# Longest line (and longest multi-line CSV record) accepted; anything longer is reported as a row error.
+MAX_LINE_BYTES = 1 << 20
+CSV_TEXT_COLUMNS = {"title", "description"}
+COPY_COLUMNS = ["title", "description", "priority", "due_date", "project_id", "status", "created_at", "updated_at"]
+
+_task_create_adapter = TypeAdapter(TaskCreate)
+
+async def iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[str | ValueError]:
+    # Lines are split as bytes and decoded one by one (UTF-8 never uses b"\n" inside a character), so an
+    # undecodable or over-long line becomes a ValueError for that line only, and at most MAX_LINE_BYTES of
+    # a line is ever held in memory.
+    encoding = "utf-8-sig"
+    pending = b""
+    overlong = False
+    async for chunk in body:
+        *lines, tail = chunk.split(b"\n")
+        for line in lines:
+            if overlong:
+                overlong = False
+            else:
+                yield _decode_line(pending + line, encoding)
+                encoding = "utf-8"
+            pending = b""
+        if overlong:
+            continue
+        pending += tail
+        if len(pending) > MAX_LINE_BYTES:
+            yield ValueError(f"Line is longer than {MAX_LINE_BYTES} bytes")
+            encoding, pending, overlong = "utf-8", b"", True
+    if pending:
+        yield _decode_line(pending, encoding)
+
+def _decode_line(line: bytes, encoding: str) -> str | ValueError:
+    if len(line) > MAX_LINE_BYTES:
+        return ValueError(f"Line is longer than {MAX_LINE_BYTES} bytes")
+    try:
+        return line.decode(encoding)
+    except UnicodeDecodeError as exc:
+        return ValueError(f"Invalid UTF-8 at byte {exc.start} of the line: {exc.reason}")
+
+async def iter_ndjson_records(lines: AsyncIterator[str | ValueError]) -> AsyncIterator[Any]:
+    async for line in lines:
+        if isinstance(line, ValueError):
+            yield line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield ValueError(f"Invalid JSON: {exc}")
+
+async def iter_csv_records(lines: AsyncIterator[str | ValueError]) -> AsyncIterator[Any]:
+    header: list[str] | None = None
+    # Lines of the current record, their total length and their quote count, kept as running totals so
+    # a long multi-line record is not rescanned for every line.
+    record: list[str] = []
+    size = quotes = 0
+    async for line in lines:
+        if isinstance(line, ValueError):
+            # A quoted record that was open is lost along with the bad line.
+            record, size, quotes = [], 0, 0
+            yield line
+            continue
+        record.append(line)
+        size += len(line) + 1
+        quotes += line.count('"')
+        # An odd number of quotes means a quoted field continues on the next line.
+        if quotes % 2:
+            if size > MAX_LINE_BYTES:
+                record, size, quotes = [], 0, 0
+                yield ValueError(f"Record is longer than {MAX_LINE_BYTES} characters (unbalanced quote?)")
+            continue
+        text = "\n".join(record)
+        record, size, quotes = [], 0, 0
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as exc:
+            yield ValueError(f"Invalid CSV: {exc}")
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        # Empty cells in non-text columns mean "not set" so they fall back to their defaults.
+        yield {name: value for name, value in zip(header, values) if value != "" or name in CSV_TEXT_COLUMNS}
+    if record:
+        yield ValueError("Unterminated quoted field")
+
+def validate_record(index: int, record: Any) -> TaskCreate | TaskBulkError:
+    if isinstance(record, ValueError):
+        return TaskBulkError(index=index, errors=[{"type": "value_error", "loc": [], "msg": str(record)}])
+    try:
+        return _task_create_adapter.validate_python(record)
+    except ValidationError as exc:
+        return TaskBulkError(index=index, errors=exc.errors(include_url=False, include_context=False))
+
+async def write_task_chunk(db: AsyncSession, project_id: int, tasks: list[TaskCreate]) -> int:
+    rows = [
+        {"title": t.title, "description": t.description, "priority": t.priority, "due_date": t.due_date, "project_id": project_id}
+        for t in tasks
+    ]
+    if db.bind.dialect.name == "postgresql":
+        # COPY skips the Python-side column defaults, so fill them in with the transaction's clock.
+        now = (await db.execute(select(func.localtimestamp()))).scalar_one()
+        records = [
+            (r["title"], r["description"], r["priority"].name, r["due_date"], project_id, TaskStatus.todo.name, now, now)
+            for r in rows
+        ]
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(Task.__tablename__, records=records, columns=COPY_COLUMNS)
+    else:
+        await db.execute(insert(Task).execution_options(render_nulls=True), rows)
+    await db.commit()
+    await response_cache.invalidate(project_tasks_tag(project_id))
+    change_feed.publish(project_id, {"type": "tasks.imported", "data": {"count": len(rows)}})
+    return len(rows)
+
+async def import_tasks(db: AsyncSession, project_id: int, records: AsyncIterator[Any], dry_run: bool = False, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict[str, Any]:
+    # Each chunk is validated and written (and committed) before the next is read, so memory is bounded
+    # by chunk_size and the error cap rather than by the size of the upload.
+    result: dict[str, Any] = {"processed": 0, "created": 0, "failed": 0, "chunks": 0, "dry_run": dry_run, "errors": [], "errors_truncated": False}
+    chunk: list[TaskCreate] = []
+
+    async def flush() -> None:
+        if chunk and not dry_run:
+            result["created"] += await write_task_chunk(db, project_id, chunk)
+        result["chunks"] += 1
+        chunk.clear()
+
+    async for record in records:
+        outcome = validate_record(result["processed"], record)
+        result["processed"] += 1
+        if isinstance(outcome, TaskBulkError):
+            result["failed"] += 1
+            if len(result["errors"]) < MAX_IMPORT_ERRORS:
+                result["errors"].append(outcome)
+            else:
+                result["errors_truncated"] = True
+            continue
+        chunk.append(outcome)
+        if len(chunk) >= chunk_size:
+            await flush()
+    if chunk:
+        await flush()
+    return result
@@ -1,25 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update
 from app.db.models.user import User
+from app.db.timestamps import timestamp_in
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from typing import Any
+from collections.abc import Sequence
+from datetime import datetime
+from app.core.security import password_hasher
+from app.core.principal import invalidate_principal
+
+async def get_user(db: AsyncSession, user_id: int) -> User | None:
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalar_one_or_none()
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     result = await db.execute(select(User).where(User.email == email))
     return result.scalar_one_or_none()
 
 async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
-    hashed_password = get_password_hash(user_data.password)
-    user = User(
+    hashed_password = await password_hasher.hash(user_data.password)
+    stmt = insert(User).values(
         email=user_data.email,
         hashed_password=hashed_password,
         full_name=user_data.full_name,
         role=user_data.role,
         is_active=True
-    )
-    db.add(user)
+    ).returning(User)
+    user = (await db.scalars(stmt)).one()
     await db.commit()
-    await db.refresh(user)
     return user
 
-
+async def update_user(db: AsyncSession, user_id: int, changes: dict[str, Any], versions: Sequence[datetime] | None = None) -> User | None:
+    # With versions set (from If-Match), only a row still at one of those updated_at values matches.
+    conditions = [User.id == user_id]
+    if versions is not None:
+        conditions.append(timestamp_in(User.updated_at, versions))
+    if not changes:
+        return (await db.scalars(select(User).where(*conditions))).one_or_none()
+    stmt = (
+        update(User)
+        .where(*conditions)
+        .values(**changes)
+        .returning(User)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    user = (await db.scalars(stmt)).one_or_none()
+    await db.commit()
+    if user is not None:
+        await invalidate_principal(user.email)
+    return user
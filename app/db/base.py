@@ -2,3 +2,7 @@ from app.db.models.user import User #type: ignore
 from app.db.models.project import Project #type: ignore
 from app.db.models.task import Task #type: ignore
 from app.db.models.task_comment import TaskComment #type: ignore
+from app.db.models.project_summary import ProjectSummary #type: ignore
+from app.db.models.tombstone import Tombstone #type: ignore
+from app.db import search #type: ignore
+from app.db import changes #type: ignore
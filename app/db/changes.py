@@ -0,0 +1,105 @@
+from sqlalchemy import DDL, BigInteger, Text, cast, column, event, func, select, table
+from sqlalchemy.sql import Select
+from typing import Any
+from app.db.models.project import Project
+from app.db.models.task import Task
+from app.db.models.task_comment import TaskComment
+from app.db.models.tombstone import Tombstone
+
+# Every insert or update stamps the row's change_seq and every delete leaves a tombstone, so
+# /sync can ask for "everything with change_seq >= token". Like search, this lives in triggers
+# so the bulk, import and raw SQL paths are covered too.
+#
+# On PostgreSQL change_seq is the writing transaction's 64-bit id. Transactions commit out of id
+# order, so the sync watermark is the oldest id still in flight (the snapshot xmin): everything
+# below it has either committed or rolled back. SQLite has a single writer, so a counter is enough.
+
+change_counter = table("change_counter", column("value"))
+
+TOMBSTONE_COLUMNS = "kind, entity_id, project_id, user_id, deleted_at"
+
+# Tombstone values (minus deleted_at) selected from a deleted row named `old`.
+TOMBSTONE_VALUES = {
+    Project.__tablename__: "'project', old.id, old.id, old.owner_id",
+    Task.__tablename__: "'task', old.id, old.project_id, old.assigned_to",
+    TaskComment.__tablename__: "'comment', old.id, (SELECT project_id FROM tasks WHERE tasks.id = old.task_id), NULL",
+}
+
+POSTGRESQL_CHANGE_SEQ_FUNCTION = """
+    CREATE OR REPLACE FUNCTION set_change_seq() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.change_seq := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END;
+    $$
+"""
+
+
+def _postgresql_change_ddl(table_name: str) -> list[str]:
+    statements = [
+        POSTGRESQL_CHANGE_SEQ_FUNCTION,
+        f"CREATE TRIGGER {table_name}_change_seq BEFORE INSERT OR UPDATE ON {table_name} "
+        "FOR EACH ROW EXECUTE FUNCTION set_change_seq()",
+    ]
+    if table_name in TOMBSTONE_VALUES:
+        values = TOMBSTONE_VALUES[table_name]
+        statements += [
+            f"""
+            CREATE OR REPLACE FUNCTION {table_name}_tombstone() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO tombstones ({TOMBSTONE_COLUMNS}) SELECT {values}, now() FROM old_rows AS old;
+                RETURN NULL;
+            END;
+            $$
+            """,
+            f"CREATE TRIGGER {table_name}_tombstone AFTER DELETE ON {table_name} "
+            f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {table_name}_tombstone()",
+        ]
+    return statements
+
+
+def _sqlite_change_ddl(table_name: str) -> list[str]:
+    # The guard on the update trigger stops it re-firing for its own change_seq update.
+    stamp = (
+        "UPDATE change_counter SET value = value + 1; "
+        f"UPDATE {table_name} SET change_seq = (SELECT value FROM change_counter) WHERE id = new.id;"
+    )
+    statements = [
+        f"CREATE TRIGGER {table_name}_change_seq_ai AFTER INSERT ON {table_name} BEGIN {stamp} END",
+        f"CREATE TRIGGER {table_name}_change_seq_au AFTER UPDATE ON {table_name} "
+        f"WHEN new.change_seq IS old.change_seq BEGIN {stamp} END",
+    ]
+    if table_name in TOMBSTONE_VALUES:
+        values = TOMBSTONE_VALUES[table_name]
+        statements.append(
+            f"CREATE TRIGGER {table_name}_tombstone AFTER DELETE ON {table_name} "
+            f"BEGIN INSERT INTO tombstones ({TOMBSTONE_COLUMNS}) SELECT {values}, CURRENT_TIMESTAMP; END"
+        )
+    return statements
+
+
+event.listen(
+    Tombstone.__table__, "after_create",
+    DDL("CREATE TABLE change_counter (value INTEGER NOT NULL)").execute_if(dialect="sqlite"),
+)
+event.listen(
+    Tombstone.__table__, "after_create",
+    DDL("INSERT INTO change_counter (value) VALUES (0)").execute_if(dialect="sqlite"),
+)
+event.listen(
+    Tombstone.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS change_counter").execute_if(dialect="sqlite"),
+)
+
+for model in (Project, Task, TaskComment, Tombstone):
+    for statement in _postgresql_change_ddl(model.__tablename__):
+        event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in _sqlite_change_ddl(model.__tablename__):
+        event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def change_watermark(dialect: str) -> Select[Any]:
+    # Every change_seq below this value belongs to a finished transaction.
+    if dialect == "postgresql":
+        return select(cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger))
+    return select(change_counter.c.value + 1)
@@ -0,0 +1,140 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, PoolProxiedConnection
+
+from app.core.config import Settings
+from app.core.metrics import instrument_engine
+from app.core.query_budget import watch_engine
+
+
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    wait_seconds_recent: float = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.timeouts += int(timed_out)
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        # Moving average over roughly the last ten checkouts.
+        self.wait_seconds_recent += (waited - self.wait_seconds_recent) * 0.2
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    metrics: PoolMetrics
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _asyncpg_connect_args(settings: Settings) -> dict[str, Any]:
+    if settings.DB_PGBOUNCER:
+        # Transaction-mode PgBouncer may hand each transaction a different server connection,
+        # so prepared statements must not be cached or reused by name, and startup parameters
+        # such as statement_timeout are rejected; fall back to asyncpg's client-side timeout.
+        args: dict[str, Any] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            args["command_timeout"] = settings.DB_STATEMENT_TIMEOUT_MS / 1000
+        return args
+    args = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return args
+
+
+def create_engine_from_settings(settings: Settings, url: str | None = None) -> AsyncEngine:
+    engine = _create_engine(settings, url or settings.DATABASE_URL)
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    watch_engine(engine)
+    return engine
+
+
+def _create_engine(settings: Settings, url: str) -> AsyncEngine:
+    parsed = make_url(url)
+    kwargs: dict[str, Any] = {"echo": settings.DB_ECHO}
+
+    if parsed.get_backend_name() == "sqlite":
+        return create_async_engine(url, **kwargs)
+
+    if parsed.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = _asyncpg_connect_args(settings)
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer does the pooling; holding connections here would only pin server slots.
+        return create_async_engine(url, poolclass=NullPool, **kwargs)
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        **kwargs,
+    )
+    engine.pool.metrics = PoolMetrics()  # type: ignore[attr-defined]
+    return engine
+
+
+def pool_wait(engine: AsyncEngine) -> float:
+    # Recent checkout wait while every connection is in use, else 0: once load drops and connections
+    # come back the signal clears, even if no checkout has happened since to lower the average.
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return 0.0
+    if pool.checkedout() < pool.size() + max(pool._max_overflow, 0):
+        return 0.0
+    return pool.metrics.wait_seconds_recent
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return stats
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    metrics = pool.metrics
+    stats.update(
+        size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_out=checked_out,
+        checked_in=pool.checkedin(),
+        overflow=pool.overflow(),
+        saturation=round(checked_out / capacity, 4) if capacity else 0.0,
+        checkouts=metrics.checkouts,
+        checkout_timeouts=metrics.timeouts,
+        checkout_wait_seconds_total=round(metrics.wait_seconds_total, 6),
+        checkout_wait_seconds_max=round(metrics.wait_seconds_max, 6),
+        checkout_wait_seconds_avg=round(metrics.wait_seconds_total / metrics.checkouts, 6) if metrics.checkouts else 0.0,
+        checkout_wait_seconds_recent=round(metrics.wait_seconds_recent, 6),
+    )
+    return stats
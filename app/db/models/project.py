@@ -1,8 +1,9 @@
-from sqlalchemy import String, Text, ForeignKey, Enum, DateTime, func
+from sqlalchemy import String, Text, ForeignKey, Enum, DateTime, BigInteger, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from enum import Enum as PyEnum
 from app.db.base_class import Base
+from app.db.timestamps import timestamp_now
 
 class ProjectStatus(PyEnum):
     active = "active"
@@ -11,13 +12,18 @@ class ProjectStatus(PyEnum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_change_seq", "change_seq"),
+        Index("ix_projects_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(Text)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     status: Mapped[ProjectStatus] = mapped_column(Enum(ProjectStatus), default=ProjectStatus.active)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now(), onupdate=timestamp_now())
+    change_seq: Mapped[int] = mapped_column(BigInteger, server_default="0")
 
     owner = relationship("User", backref="owned_projects")
\ No newline at end of file
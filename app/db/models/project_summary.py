@@ -0,0 +1,17 @@
+from sqlalchemy import ForeignKey, Integer, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base_class import Base
+
+class ProjectSummary(Base):
+    __tablename__ = "project_summaries"
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    todo_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    in_progress_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    done_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    low_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    medium_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    high_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), server_default=func.now())
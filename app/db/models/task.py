@@ -1,8 +1,9 @@
-from sqlalchemy import String, Text, ForeignKey, Enum, DateTime, func
+from sqlalchemy import String, Text, ForeignKey, Enum, DateTime, BigInteger, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from enum import Enum as PyEnum
 from app.db.base_class import Base
+from app.db.timestamps import timestamp_now
 
 class TaskStatus(PyEnum):
     todo = "todo"
@@ -16,6 +17,26 @@ class TaskPriority(PyEnum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_change_seq", "change_seq"),
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_id_status", "project_id", "status", "created_at", "id"),
+        Index(
+            "ix_tasks_project_id_due_date", "project_id", "due_date",
+            postgresql_where=text("due_date IS NOT NULL"),
+            sqlite_where=text("due_date IS NOT NULL"),
+        ),
+        Index(
+            "ix_tasks_project_id_open_due_date", "project_id", "due_date",
+            postgresql_where=text("due_date IS NOT NULL AND status <> 'done'"),
+            sqlite_where=text("due_date IS NOT NULL AND status <> 'done'"),
+        ),
+        Index(
+            "ix_tasks_assigned_to", "assigned_to",
+            postgresql_where=text("assigned_to IS NOT NULL"),
+            sqlite_where=text("assigned_to IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -25,8 +46,9 @@ class Task(Base):
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), default=TaskStatus.todo)
     priority: Mapped[TaskPriority] = mapped_column(Enum(TaskPriority), default=TaskPriority.medium)
     due_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now(), onupdate=timestamp_now())
+    change_seq: Mapped[int] = mapped_column(BigInteger, server_default="0")
 
     project = relationship("Project", backref="tasks")
     assignee = relationship("User", backref="assigned_tasks", foreign_keys=[assigned_to])
@@ -1,17 +1,23 @@
-from sqlalchemy import Text, ForeignKey, DateTime, func
+from sqlalchemy import Text, ForeignKey, DateTime, BigInteger, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base_class import Base
+from app.db.timestamps import timestamp_now
 
 class TaskComment(Base):
     __tablename__ = "task_comments"
+    __table_args__ = (
+        Index("ix_task_comments_change_seq", "change_seq"),
+        Index("ix_task_comments_task_id_created_at_id", "task_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"))
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     comment_text: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now(), onupdate=timestamp_now())
+    change_seq: Mapped[int] = mapped_column(BigInteger, server_default="0")
 
     task = relationship("Task", backref="comments")
     user = relationship("User", backref="comments")
@@ -0,0 +1,20 @@
+from sqlalchemy import String, Integer, BigInteger, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base_class import Base
+
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_change_seq", "change_seq"),
+    )
+
+    # Written by the delete triggers in app/db/changes.py. No foreign keys: the rows they point at are gone.
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    project_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Who could see the row other than through its project: a project's owner or a task's assignee.
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    change_seq: Mapped[int] = mapped_column(BigInteger, server_default="0")
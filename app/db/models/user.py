@@ -1,8 +1,9 @@
 from app.db.base_class import Base
+from app.db.timestamps import timestamp_now
 from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Boolean, DateTime, Enum, func
+from sqlalchemy import String, Boolean, DateTime, Enum
 
 class UserRole(PyEnum):
     admin = "admin"
@@ -18,5 +19,5 @@ class User(Base):
     full_name: Mapped[str] = mapped_column(String)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.user)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=timestamp_now(), onupdate=timestamp_now())
\ No newline at end of file
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+from app.db import base  # noqa: F401
+from app.db.session import async_session
+from app.crud.summary import find_summary_drift, rebuild_project_summaries
+
+async def rebuild_summaries(project_ids: list[int] | None, verify: bool, rebuild_all: bool) -> int:
+    async with async_session() as db:
+        drifted = await find_summary_drift(db, project_ids)
+        print(f"{len(drifted)} project summaries out of date" + (f": {drifted}" if drifted else ""))
+        if verify:
+            return 1 if drifted else 0
+        if rebuild_all:
+            rebuilt = await rebuild_project_summaries(db, project_ids)
+        elif drifted:
+            rebuilt = await rebuild_project_summaries(db, drifted)
+        else:
+            rebuilt = 0
+        print(f"Rebuilt {rebuilt} project summaries")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify or repair the project_summaries table")
+    parser.add_argument("--verify", action="store_true", help="only report drift; exit 1 if any is found")
+    parser.add_argument("--all", action="store_true", help="rebuild every summary, not just drifted ones")
+    parser.add_argument("--project-id", type=int, action="append", help="limit to this project (repeatable)")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(rebuild_summaries(args.project_id, args.verify, args.all)))
@@ -0,0 +1,56 @@
+from sqlalchemy import DDL, event, column, table, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app.db.models.task import Task
+from app.db.models.task_comment import TaskComment
+
+# Full-text search lives outside the ORM models: a generated tsvector column plus GIN index
+# on PostgreSQL, and external-content FTS5 tables kept in sync by triggers on SQLite.
+SEARCH_CONFIG = "english"
+
+TASK_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+COMMENT_SEARCH_VECTOR = f"to_tsvector('{SEARCH_CONFIG}', coalesce(comment_text, ''))"
+
+task_search_vector = literal_column("tasks.search_vector", TSVECTOR)
+comment_search_vector = literal_column("task_comments.search_vector", TSVECTOR)
+
+tasks_fts = table("tasks_fts", column("rowid"))
+task_comments_fts = table("task_comments_fts", column("rowid"))
+
+
+def _postgresql_ddl(table_name: str, expression: str) -> list[str]:
+    return [
+        f"ALTER TABLE {table_name} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({expression}) STORED",
+        f"CREATE INDEX ix_{table_name}_search_vector ON {table_name} USING gin (search_vector) WITH (fastupdate = on)",
+    ]
+
+
+def _sqlite_ddl(table_name: str, columns: list[str]) -> list[str]:
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    fts = f"{table_name}_fts"
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table_name}', content_rowid='id')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table_name} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table_name} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table_name} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+for model, expression, columns in (
+    (Task, TASK_SEARCH_VECTOR, ["title", "description"]),
+    (TaskComment, COMMENT_SEARCH_VECTOR, ["comment_text"]),
+):
+    for statement in _postgresql_ddl(model.__tablename__, expression):
+        event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in _sqlite_ddl(model.__tablename__, columns):
+        event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        model.__table__, "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {model.__tablename__}_fts").execute_if(dialect="sqlite"),
+    )
@@ -1,22 +1,86 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-import os
-from dotenv import load_dotenv
+import itertools
+import time
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from typing import AsyncGenerator
 
-load_dotenv()
+from app.core.cache import create_cache_backend
+from app.core.config import settings
+from app.db.engine import create_engine_from_settings
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set")
+class PrimarySession(AsyncSession):
+    async def commit(self) -> None:
+        await super().commit()
+        # get_current_user tags the session with the caller. Opening their read-your-writes window here,
+        # rather than in get_db's teardown, means it is open before the response reaches the client.
+        principal_id = self.info.get("principal_id")
+        if principal_id is not None:
+            await mark_recent_write(principal_id)
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_engine_from_settings(settings)
 
 async_session = async_sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=PrimarySession,
     expire_on_commit=False
 )
 
+recent_writes = create_cache_backend(settings.READ_YOUR_WRITES_CACHE_URL)
+
+async def mark_recent_write(user_id: int) -> None:
+    await recent_writes.set(f"ryw:{user_id}", b"1", settings.READ_YOUR_WRITES_SECONDS)
+
+async def wrote_recently(user_id: int) -> bool:
+    return await recent_writes.get(f"ryw:{user_id}") is not None
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+def is_primary(session: AsyncSession) -> bool:
+    # Replicas lag: what one returns right after a write may predate it, so it must not be cached.
+    return isinstance(session, PrimarySession)
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine: AsyncEngine = create_engine_from_settings(settings, url)
+        self.sessionmaker = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= time.monotonic()
+
+class ReplicaRouter:
+    def __init__(self, urls: list[str], retry_seconds: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+
+    async def open_session(self) -> AsyncSession | None:
+        if not self.replicas:
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if not replica.healthy:
+                continue
+            session = replica.sessionmaker()
+            try:
+                # Check out the connection now so a dead replica is skipped before the route runs.
+                await session.connection()
+            except (OSError, TimeoutError, exc.DBAPIError, exc.TimeoutError):
+                await session.close()
+                replica.down_until = time.monotonic() + self.retry_seconds
+                continue
+            return session
+        return None
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    settings.REPLICA_RETRY_SECONDS,
+)
+
+async def open_read_session() -> AsyncSession:
+    # For work that outlives the request's dependencies, e.g. a streaming response body.
+    return await replica_router.open_session() or async_session()
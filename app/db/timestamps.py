@@ -0,0 +1,42 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+from sqlalchemy import ColumnElement, DateTime, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# updated_at doubles as the ETag version, so it needs sub-second precision and an equality check that
+# does not depend on how the database stores it. PostgreSQL gives both natively; SQLite's CURRENT_TIMESTAMP
+# is whole seconds and its datetimes are text, which only compare equal when formatted the same way.
+
+class timestamp_now(FunctionElement[datetime]):
+    # The current time: now() on PostgreSQL, milliseconds padded to six digits on SQLite so the stored
+    # text parses back to the same datetime.
+    type = DateTime()
+    name = "timestamp_now"
+    inherit_cache = True
+
+@compiles(timestamp_now)
+def _compile_now(element: timestamp_now, compiler: Any, **kw: Any) -> str:
+    return "now()"
+
+@compiles(timestamp_now, "sqlite")
+def _compile_now_sqlite(element: timestamp_now, compiler: Any, **kw: Any) -> str:
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+class _timestamp_key(FunctionElement[Any]):
+    # The value itself, or on SQLite its julianday() number, which is the same whatever the text format.
+    type = DateTime()
+    name = "timestamp_key"
+    inherit_cache = True
+
+@compiles(_timestamp_key)
+def _compile_key(element: _timestamp_key, compiler: Any, **kw: Any) -> str:
+    return compiler.process(element.clauses, **kw)
+
+@compiles(_timestamp_key, "sqlite")
+def _compile_key_sqlite(element: _timestamp_key, compiler: Any, **kw: Any) -> str:
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+def timestamp_in(column: ColumnElement[datetime], values: Sequence[datetime]) -> ColumnElement[bool]:
+    return _timestamp_key(column).in_([_timestamp_key(literal(value, DateTime())) for value in values])
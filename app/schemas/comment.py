@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from app.schemas.user import UserBrief
 
 class CommentBase(BaseModel):
     comment_text: str
@@ -16,3 +17,6 @@ class CommentOut(CommentBase):
 
     class Config:
         from_attributes = True
+
+class CommentExpandedOut(CommentOut):
+    user: UserBrief | None = None
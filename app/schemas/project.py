@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from enum import Enum
 from datetime import datetime
+from app.schemas.task import TaskStatus, TaskPriority, TaskExpandedOut
+from app.schemas.user import UserBrief
 
 class ProjectStatus(str, Enum):
     active = "active"
@@ -19,12 +21,26 @@ class ProjectUpdate(BaseModel):
     description: str | None = None
     status: ProjectStatus | None = None
 
+class ProjectSummaryOut(BaseModel):
+    project_id: int
+    tasks_by_status: dict[TaskStatus, int]
+    tasks_by_priority: dict[TaskPriority, int]
+    total_tasks: int
+    overdue_count: int
+    comment_count: int
+
 class ProjectOut(ProjectBase):
     id: int
     owner_id: int
     status: ProjectStatus
     created_at: datetime
     updated_at: datetime
+    summary: ProjectSummaryOut | None = None
 
     class Config:
         from_attributes = True
+
+class ProjectExpandedOut(ProjectOut):
+    owner: UserBrief | None = None
+    tasks: list[TaskExpandedOut] | None = None
+    tasks_truncated: bool | None = None
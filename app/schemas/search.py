@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Literal
+
+class SearchHit(BaseModel):
+    kind: Literal["task", "comment"]
+    id: int
+    task_id: int
+    project_id: int
+    title: str
+    text: str | None = None
+    rank: float
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Literal
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+from app.schemas.comment import CommentOut
+
+class SyncTombstone(BaseModel):
+    kind: Literal["project", "task", "comment"]
+    entity_id: int
+    project_id: int | None = None
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SyncOut(BaseModel):
+    projects: list[ProjectOut]
+    tasks: list[TaskOut]
+    comments: list[CommentOut]
+    deleted: list[SyncTombstone]
+    next_token: str
+    has_more: bool
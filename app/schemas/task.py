@@ -1,6 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from enum import Enum
 from datetime import datetime
+from typing import Any
+from app.schemas.user import UserBrief
+from app.schemas.comment import CommentExpandedOut
 
 class TaskStatus(str, Enum):
     todo = "todo"
@@ -28,6 +31,18 @@ class TaskUpdate(BaseModel):
     status: TaskStatus | None = None
     due_date: datetime | None = None
 
+class TaskFilter(BaseModel):
+    status: list[TaskStatus] | None = None
+    priority: list[TaskPriority] | None = None
+    assigned_to: int | None = None
+    due_before: datetime | None = None
+    due_after: datetime | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        # Mirrors task_filter_conditions: empty lists and nulls add no condition.
+        return not self.status and not self.priority and all(value is None for value in (self.assigned_to, self.due_before, self.due_after))
+
 class TaskOut(TaskBase):
     id: int
     project_id: int
@@ -38,3 +53,57 @@ class TaskOut(TaskBase):
 
     class Config:
         from_attributes = True
+
+class TaskExpandedOut(TaskOut):
+    assignee: UserBrief | None = None
+    comments: list[CommentExpandedOut] | None = None
+    comments_truncated: bool | None = None
+
+class TaskBulkError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+class TaskBulkResult(BaseModel):
+    created: list[TaskOut]
+    errors: list[TaskBulkError] = []
+
+class TaskImportResult(BaseModel):
+    processed: int
+    created: int
+    failed: int
+    chunks: int
+    dry_run: bool
+    errors: list[TaskBulkError] = []
+    errors_truncated: bool = False
+
+class TaskBulkChanges(BaseModel):
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+    assigned_to: int | None = None
+
+    @model_validator(mode="after")
+    def check_not_null(self) -> "TaskBulkChanges":
+        # Omitted means unchanged; only assigned_to may be set to null (unassign).
+        for name in ("status", "priority"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"'{name}' cannot be null")
+        return self
+
+class TaskBulkUpdate(BaseModel):
+    ids: list[int] | None = None
+    filter: TaskFilter | None = None
+    changes: TaskBulkChanges
+
+    @model_validator(mode="after")
+    def check_target(self) -> "TaskBulkUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.filter is not None and self.filter.is_empty:
+            raise ValueError("'filter' must set at least one condition")
+        if not self.changes.model_fields_set:
+            raise ValueError("'changes' must set at least one field")
+        return self
+
+class TaskBulkUpdateResult(BaseModel):
+    updated: list[int]
+    refused: list[int]
@@ -25,3 +25,11 @@ class UserOut(UserBase):
 
     class Config:
         from_attributes = True
+
+class UserBrief(BaseModel):
+    id: int
+    email: EmailStr
+    full_name: str | None = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,95 @@
+"""Time from launching the server to its first response, and from SIGTERM to exit.
+
+    python -m benchmarks.cold_start --rounds 5 --workers 4
+    python -m benchmarks.cold_start --command "uvicorn main:app --port {port}"   # compare another launcher
+
+Starts the production launcher (gunicorn with gunicorn.conf.py) as a subprocess, polls GET /healthz/public
+over HTTP until it answers and reads the slowest worker's startup phases from /metrics, then sends
+SIGTERM and waits for the process to exit. Prints JSON with percentiles of both over the rounds and the
+details of each round. Unlike the other benchmarks this needs gunicorn (or the given command) installed.
+"""
+import argparse
+import json
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import percentiles
+
+ROOT = Path(__file__).resolve().parent.parent
+_STARTUP = re.compile(r'^worker_startup_seconds\{phase="(\w+)"(?:,worker="\d+")?\} ([\d.e-]+)$', re.M)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def one_round(command: str | None, workers: int, timeout: float) -> dict:
+    port = free_port()
+    if command:
+        args = shlex.split(command.format(port=port))
+    else:
+        args = [sys.executable, "-m", "gunicorn", "main:app", "--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+    url = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(args, cwd=ROOT, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server exited with {process.returncode}:\n{process.stderr.read().decode()}")
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError(f"No response within {timeout}s")
+                try:
+                    if client.get(f"{url}/healthz/public").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            first_response = time.perf_counter() - started
+            # Under gunicorn /metrics covers every worker that has reported so far; keep the slowest per phase.
+            worker: dict[str, float] = {}
+            for phase, seconds in _STARTUP.findall(client.get(f"{url}/metrics").text):
+                worker[phase] = max(worker.get(phase, 0.0), float(seconds))
+
+        stopping = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout)
+        shutdown = time.perf_counter() - stopping
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return {"first_response_seconds": round(first_response, 4), "shutdown_seconds": round(shutdown, 4), "worker_startup_seconds": worker}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--command", help="launch command instead of gunicorn; {port} is replaced with a free port")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for the first response and for exit")
+    args = parser.parse_args()
+
+    rounds = [one_round(args.command, args.workers, args.timeout) for _ in range(args.rounds)]
+    result = {
+        "command": args.command or f"gunicorn main:app --workers {args.workers}",
+        "first_response": percentiles([r["first_response_seconds"] for r in rounds]),
+        "shutdown": percentiles([r["shutdown_seconds"] for r in rounds]),
+        "rounds": rounds,
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
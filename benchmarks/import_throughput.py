@@ -0,0 +1,86 @@
+"""Throughput and peak memory of the streaming task import.
+
+    python -m benchmarks.import_throughput --rows 10000 100000 --format csv
+    python -m benchmarks.import_throughput --rows 10000 100000 --memory   # also trace peak Python memory
+
+The upload body is generated lazily, so the client side holds no more than one chunk.
+Prints JSON with rows/second for each size and, with --memory, the tracemalloc peak of the import.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+import uuid
+from typing import AsyncIterator
+
+from benchmarks.common import app_client, create_schema
+
+
+async def upload_body(rows: int, fmt: str, rows_per_chunk: int = 500) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        yield b"title,description,priority,due_date\n"
+    lines = []
+    for i in range(rows):
+        if fmt == "csv":
+            lines.append(f"Imported task {i},\"Row {i}, from the old tracker\",high,2030-01-01T00:00:00\n")
+        else:
+            lines.append(json.dumps({"title": f"Imported task {i}", "description": f"Row {i}", "priority": "high"}) + "\n")
+        if len(lines) == rows_per_chunk:
+            yield "".join(lines).encode()
+            lines.clear()
+    if lines:
+        yield "".join(lines).encode()
+
+
+async def run(sizes: list[int], fmt: str, chunk_size: int, dry_run: bool, memory: bool, create: bool) -> dict:
+    if create:
+        await create_schema()
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    results = []
+    async with app_client() as client:
+        await client.post("/auth/register", json={"email": email, "password": "bench-password", "full_name": "Bench", "role": "manager"})
+        token = (await client.post("/auth/login", data={"username": email, "password": "bench-password"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for rows in sizes:
+            project_id = (await client.post("/projects/", json={"name": f"import-{rows}", "description": "import benchmark"}, headers=headers)).json()["id"]
+            params = {"format": fmt, "chunk_size": chunk_size, "dry_run": dry_run}
+            if memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            response = await client.post(
+                f"/projects/{project_id}/tasks/import", params=params, content=upload_body(rows, fmt), headers=headers
+            )
+            elapsed = time.perf_counter() - started
+            entry = {
+                "rows": rows,
+                "status": response.status_code,
+                "created": response.json().get("created"),
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(rows / elapsed),
+            }
+            if memory:
+                entry["peak_traced_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+                tracemalloc.stop()
+            results.append(entry)
+
+    return {"format": fmt, "chunk_size": chunk_size, "dry_run": dry_run, "runs": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="validate only")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory (slows the run down)")
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (e.g. for a scratch SQLite database)")
+    args = parser.parse_args()
+    result = asyncio.run(run(args.rows, args.format, args.chunk_size, args.dry_run, args.memory, args.create_schema))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""ORM + pydantic vs. column rows + orjson for one large page of tasks.
+
+    python -m benchmarks.list_serialization --sizes 1000 10000 100000 --create-schema
+
+Seeds a project with the largest size once, then for each size times:
+  orm:  get_tasks_by_project -> Page[TaskOut].model_validate(from_attributes) -> model_dump_json
+  lean: get_task_rows_by_project -> dump_page (orjson)
+Prints JSON with the best-of-N time for the query and the serialization of each path.
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from benchmarks.common import create_schema
+
+
+async def seed(rows: int) -> int:
+    from sqlalchemy import insert
+    from app.db.session import async_session
+    from app.db.models.user import User, UserRole
+    from app.db.models.project import Project
+    from app.db.models.task import Task, TaskPriority
+
+    async with async_session() as db:
+        user_id = (await db.scalars(insert(User).values(
+            email=f"bench-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", full_name="Bench", role=UserRole.manager,
+        ).returning(User.id))).one()
+        project_id = (await db.scalars(insert(Project).values(
+            name="serialization", description="benchmark", owner_id=user_id,
+        ).returning(Project.id))).one()
+        priorities = list(TaskPriority)
+        for start in range(0, rows, 5000):
+            await db.execute(insert(Task), [
+                {"title": f"Task {i}", "description": f"Description of task {i}", "project_id": project_id, "priority": priorities[i % 3]}
+                for i in range(start, min(rows, start + 5000))
+            ])
+        await db.commit()
+    return project_id
+
+
+async def measure(project_id: int, size: int, repeat: int) -> dict:
+    from app.db.session import async_session
+    from app.crud.task import get_tasks_by_project, get_task_rows_by_project
+    from app.core.serialization import dump_page
+    from app.schemas.pagination import Page
+    from app.schemas.task import TaskOut
+
+    best = {"orm_query": float("inf"), "orm_serialize": float("inf"), "lean_query": float("inf"), "lean_serialize": float("inf")}
+    for _ in range(repeat):
+        async with async_session() as db:
+            started = time.perf_counter()
+            tasks, cursor = await get_tasks_by_project(db, project_id, limit=size)
+            queried = time.perf_counter()
+            body = Page[TaskOut].model_validate({"items": tasks, "next_cursor": cursor}, from_attributes=True).model_dump_json()
+            done = time.perf_counter()
+            best["orm_query"] = min(best["orm_query"], queried - started)
+            best["orm_serialize"] = min(best["orm_serialize"], done - queried)
+        async with async_session() as db:
+            started = time.perf_counter()
+            rows, cursor = await get_task_rows_by_project(db, project_id, limit=size)
+            queried = time.perf_counter()
+            lean_body = dump_page(rows, cursor)
+            done = time.perf_counter()
+            best["lean_query"] = min(best["lean_query"], queried - started)
+            best["lean_serialize"] = min(best["lean_serialize"], done - queried)
+    assert body.encode() == lean_body, "the two paths must produce identical JSON"
+    orm_total = best["orm_query"] + best["orm_serialize"]
+    lean_total = best["lean_query"] + best["lean_serialize"]
+    return {
+        "tasks": size,
+        **{f"{name}_ms": round(value * 1000, 2) for name, value in best.items()},
+        "orm_total_ms": round(orm_total * 1000, 2),
+        "lean_total_ms": round(lean_total * 1000, 2),
+        "speedup": round(orm_total / lean_total, 2),
+    }
+
+
+async def run(sizes: list[int], repeat: int, create: bool) -> dict:
+    if create:
+        await create_schema()
+    project_id = await seed(max(sizes))
+    return {"repeat": repeat, "runs": [await measure(project_id, size, repeat) for size in sizes]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (e.g. for a scratch SQLite database)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sizes, args.repeat, args.create_schema)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
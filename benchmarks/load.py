@@ -0,0 +1,212 @@
+"""Replay a mix of API calls against the in-process app and report latency per operation.
+
+    python -m benchmarks.load --duration 60 --concurrency 50 --virtual-users 200
+    python -m benchmarks.load --requests 20000 --mix list_tasks=40,read_task=40,update_task=20
+
+Logs in as users created by benchmarks.seed (seeding a small dataset first if there are none), then
+`--concurrency` workers each pick an operation by weight and a random virtual user until the duration
+or request count runs out. Reads target tasks sampled across the whole dataset; updates only touch
+tasks assigned to the acting user, since that is all a non-admin may change.
+
+Prints JSON: overall throughput and error count, and per operation the count, requests/second, status
+codes and latency percentiles. The current git commit is included so runs can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+# A few virtual users drive the whole load, so per-user limits would cap the run rather than the app.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from benchmarks.common import app_client, create_schema, percentiles, timed  # noqa: E402
+from benchmarks.seed import PASSWORD, seed  # noqa: E402
+
+DEFAULT_MIX = {
+    "login": 2,
+    "list_projects": 10,
+    "list_tasks": 30,
+    "read_task": 25,
+    "update_task": 8,
+    "list_comments": 15,
+    "add_comment": 10,
+}
+
+TASK_STATUSES = ("todo", "in_progress", "done")
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    headers: dict[str, str] = field(default_factory=dict)
+    assigned: list[tuple[int, int]] = field(default_factory=list)  # (project_id, task_id)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"Expected name=weight with a name from {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    return mix
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def load_targets(prefix: str, virtual_users: int, sample_size: int, rng: random.Random) -> tuple[list[VirtualUser], list[tuple[int, int]]]:
+    from sqlalchemy import func, select
+
+    from app.db.models.task import Task
+    from app.db.models.user import User
+    from app.db.session import async_session
+
+    async with async_session() as db:
+        users = (await db.execute(select(User.id, User.email).where(User.email.like(f"{prefix}-%@bench.test")))).all()
+        chosen = rng.sample(users, min(virtual_users, len(users)))
+        by_id = {user_id: VirtualUser(email) for user_id, email in chosen}
+        assigned = await db.execute(
+            select(Task.assigned_to, Task.project_id, Task.id).where(Task.assigned_to.in_(by_id)).limit(len(by_id) * 50)
+        )
+        for user_id, project_id, task_id in assigned:
+            by_id[user_id].assigned.append((project_id, task_id))
+
+        # Random ids across the range rather than ORDER BY random(), which would scan every task.
+        low, high = (await db.execute(select(func.min(Task.id), func.max(Task.id)))).one()
+        tasks: list[tuple[int, int]] = []
+        if low is not None:
+            ids = {rng.randint(low, high) for _ in range(sample_size)}
+            tasks = [(project_id, task_id) for task_id, project_id in await db.execute(select(Task.id, Task.project_id).where(Task.id.in_(ids)))]
+    return list(by_id.values()), tasks
+
+
+async def login(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    response = await client.post("/auth/login", data={"username": user.email, "password": PASSWORD})
+    if response.status_code == 200:
+        user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return response
+
+
+async def run(duration: float | None, requests: int | None, concurrency: int, virtual_users: int, mix: dict[str, int], prefix: str, seed_value: int, create: bool) -> dict[str, Any]:
+    rng = random.Random(seed_value)
+    if create:
+        await create_schema()
+    users, tasks = await load_targets(prefix, virtual_users, 2000, rng)
+    bootstrapped = not users or not tasks
+    if bootstrapped:
+        await seed(200, 500, 20_000, 20_000, prefix=prefix, seed_value=seed_value)
+        users, tasks = await load_targets(prefix, virtual_users, 2000, rng)
+    updaters = [user for user in users if user.assigned]
+
+    samples: defaultdict[str, list[float]] = defaultdict(list)
+    statuses: defaultdict[str, defaultdict[int, int]] = defaultdict(lambda: defaultdict(int))
+    names, weights = list(mix), list(mix.values())
+
+    async with app_client() as client:
+        for user in users:
+            await login(client, user)
+
+        async def operation(name: str) -> httpx.Response:
+            user = rng.choice(users)
+            project_id, task_id = rng.choice(tasks)
+            if name == "login":
+                return await login(client, user)
+            if name == "list_projects":
+                return await client.get("/projects/", params={"limit": 50}, headers=user.headers)
+            if name == "list_tasks":
+                return await client.get(f"/projects/{project_id}/tasks/", params={"limit": 50}, headers=user.headers)
+            if name == "read_task":
+                return await client.get(f"/projects/{project_id}/tasks/{task_id}", headers=user.headers)
+            if name == "update_task" and updaters:
+                user = rng.choice(updaters)
+                project_id, task_id = rng.choice(user.assigned)
+                return await client.put(f"/projects/{project_id}/tasks/{task_id}", json={"status": rng.choice(TASK_STATUSES)}, headers=user.headers)
+            if name == "list_comments":
+                return await client.get(f"/tasks/{task_id}/comments/", params={"limit": 50}, headers=user.headers)
+            return await client.post(f"/tasks/{task_id}/comments/", json={"comment_text": "load test comment"}, headers=user.headers)
+
+        remaining = requests
+        started = time.perf_counter()
+        deadline = started + duration if duration else None
+
+        async def worker() -> None:
+            nonlocal remaining
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                name = rng.choices(names, weights)[0]
+                if name == "update_task" and not updaters:
+                    continue
+                elapsed, response = await timed(operation(name))
+                samples[name].append(elapsed)
+                statuses[name][response.status_code] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    total = sum(len(s) for s in samples.values())
+    errors = sum(count for codes in statuses.values() for status, count in codes.items() if status >= 400)
+    return {
+        "git_commit": git_commit(),
+        "config": {
+            "duration": duration,
+            "requests": requests,
+            "concurrency": concurrency,
+            "virtual_users": len(users),
+            "mix": mix,
+            "seed": seed_value,
+            "bootstrapped": bootstrapped,
+        },
+        "wall_seconds": round(wall, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / wall, 1) if wall else None,
+        "errors": errors,
+        "operations": {
+            name: {
+                "rps": round(len(samples[name]) / wall, 1) if wall else None,
+                "status_codes": {str(status): count for status, count in sorted(statuses[name].items())},
+                **percentiles(samples[name]),
+            }
+            for name in sorted(samples)
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument("--duration", type=float, help="seconds to run (default 30 unless --requests is given)")
+    limit.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--virtual-users", type=int, default=100, help="seeded users to log in as")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="operation weights, e.g. list_tasks=40,read_task=60")
+    parser.add_argument("--prefix", default="load", help="email prefix the users were seeded with")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (e.g. for a scratch SQLite database)")
+    args = parser.parse_args()
+    duration = args.duration if args.duration or args.requests else 30.0
+    result = asyncio.run(
+        run(duration, args.requests, args.concurrency, args.virtual_users, args.mix, args.prefix, args.seed, args.create_schema)
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
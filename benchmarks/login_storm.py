@@ -0,0 +1,79 @@
+"""Latency of an unrelated endpoint while a burst of logins is in flight.
+
+    python -m benchmarks.login_storm --logins 200 --concurrency 50
+    python -m benchmarks.login_storm --inline   # bcrypt on the event loop, for comparison
+
+Prints JSON with p50/p95/p99 of GET /healthz/public probes and of the logins themselves.
+"""
+import argparse
+import asyncio
+import json
+import uuid
+
+from benchmarks.common import app_client, create_schema, percentiles, timed
+
+
+async def run(logins: int, concurrency: int, inline: bool, create: bool) -> dict:
+    from app.core.security import password_hasher, get_password_hash, verify_password
+
+    if inline:
+        async def _inline(fn, *args):
+            return fn(*args)
+        password_hasher._run = _inline  # type: ignore[method-assign]
+
+    if create:
+        await create_schema()
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    async with app_client() as client:
+        await client.post("/auth/register", json={"email": email, "password": "bench-password", "full_name": "Bench"})
+
+        done = asyncio.Event()
+        probe_samples: list[float] = []
+        login_samples: list[float] = []
+        statuses: dict[int, int] = {}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def probe() -> None:
+            while not done.is_set():
+                elapsed, _ = await timed(client.get("/healthz/public"))
+                probe_samples.append(elapsed)
+                await asyncio.sleep(0.005)
+
+        async def login() -> None:
+            async with semaphore:
+                elapsed, response = await timed(
+                    client.post("/auth/login", data={"username": email, "password": "bench-password"})
+                )
+            login_samples.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        prober = asyncio.create_task(probe())
+        await asyncio.gather(*(login() for _ in range(logins)))
+        done.set()
+        await prober
+
+    return {
+        "mode": "inline" if inline else "pool",
+        "logins": logins,
+        "concurrency": concurrency,
+        "pool_workers": password_hasher.workers,
+        "login_status_codes": statuses,
+        "unrelated_endpoint": percentiles(probe_samples),
+        "login": percentiles(login_samples),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop (pre-pool behaviour)")
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (e.g. for a scratch SQLite database)")
+    args = parser.parse_args()
+    result = asyncio.run(run(args.logins, args.concurrency, args.inline, args.create_schema))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
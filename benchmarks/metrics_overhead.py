@@ -0,0 +1,86 @@
+"""Cost of the metrics middleware and engine hooks on a cheap database-backed request.
+
+    python -m benchmarks.metrics_overhead --requests 2000 --rounds 5 --create-schema
+
+Times GET /projects/{id}/tasks/{task_id} (response cache off, so every request queries the database)
+with metrics on and off, alternating rounds so drift hits both sides equally. Prints JSON with the
+latency of each side over all rounds and the overhead of "on" relative to "off" at the mean and p50.
+"""
+import argparse
+import asyncio
+import json
+import os
+import uuid
+
+os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+os.environ.setdefault("METRICS_ENABLED", "true")
+
+from benchmarks.common import app_client, create_schema, percentiles, timed  # noqa: E402
+
+
+def set_metrics(app, enabled: bool) -> None:
+    from sqlalchemy import event
+    from starlette.middleware import Middleware
+    from app.core.metrics import MetricsMiddleware, _before_cursor_execute, _after_cursor_execute
+    from app.db.session import engine
+
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not MetricsMiddleware]
+    hooks = (("before_cursor_execute", _before_cursor_execute), ("after_cursor_execute", _after_cursor_execute))
+    for name, hook in hooks:
+        if event.contains(engine.sync_engine, name, hook):
+            event.remove(engine.sync_engine, name, hook)
+    if enabled:
+        app.user_middleware.insert(0, Middleware(MetricsMiddleware))
+        for name, hook in hooks:
+            event.listen(engine.sync_engine, name, hook)
+    app.middleware_stack = None  # rebuilt on the next request
+
+
+async def run(requests: int, rounds: int, create: bool) -> dict:
+    from main import app
+
+    if create:
+        await create_schema()
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    async with app_client() as client:
+        await client.post("/auth/register", json={"email": email, "password": "bench-password", "full_name": "Bench", "role": "manager"})
+        token = (await client.post("/auth/login", data={"username": email, "password": "bench-password"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = (await client.post("/projects/", json={"name": "metrics", "description": "benchmark"}, headers=headers)).json()["id"]
+        task_id = (await client.post(f"/projects/{project_id}/tasks/", json={"title": "t", "description": "d"}, headers=headers)).json()["id"]
+        url = f"/projects/{project_id}/tasks/{task_id}"
+
+        samples: dict[str, list[float]] = {"off": [], "on": []}
+        for _ in range(rounds):
+            for mode in ("off", "on"):
+                set_metrics(app, mode == "on")
+                for _ in range(50):
+                    await client.get(url, headers=headers)
+                for _ in range(requests):
+                    elapsed, _ = await timed(client.get(url, headers=headers))
+                    samples[mode].append(elapsed)
+        set_metrics(app, True)
+
+    off, on = percentiles(samples["off"]), percentiles(samples["on"])
+    return {
+        "requests_per_side": requests * rounds,
+        "off": off,
+        "on": on,
+        "overhead_mean_pct": round((on["mean_ms"] / off["mean_ms"] - 1) * 100, 2),
+        "overhead_p50_pct": round((on["p50_ms"] / off["p50_ms"] - 1) * 100, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="timed requests per side per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (e.g. for a scratch SQLite database)")
+    args = parser.parse_args()
+    result = asyncio.run(run(args.requests, args.rounds, args.create_schema))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
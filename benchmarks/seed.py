@@ -0,0 +1,175 @@
+"""Bulk-load a synthetic dataset for load tests.
+
+    python -m benchmarks.seed --users 10000 --projects 100000 --tasks 10000000 --comments 20000000
+    python -m benchmarks.seed --users 200 --projects 1000 --tasks 50000 --comments 100000 --create-schema   # SQLite-sized
+
+Users are <prefix>-<n>@bench.test with the password "bench-password" (what benchmarks.load logs in
+with); about 1% are admins and 20% managers, who own the projects. Tasks and comments are skewed
+towards the lower-numbered projects and tasks so some are hot. The same --seed gives the same data.
+
+Ids are assigned here, continuing after the current maximum, so foreign keys never need a lookup.
+On PostgreSQL each batch is a COPY, elsewhere a batched INSERT, and each batch commits on its own.
+Prints JSON with rows and rows/second per table.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any
+
+from benchmarks.common import create_schema
+
+PASSWORD = "bench-password"
+
+USER_COLUMNS = ("id", "email", "hashed_password", "full_name", "role", "is_active", "created_at", "updated_at")
+PROJECT_COLUMNS = ("id", "name", "description", "owner_id", "status", "created_at", "updated_at")
+TASK_COLUMNS = (
+    "id", "title", "description", "project_id", "assigned_to", "status", "priority", "due_date", "created_at", "updated_at",
+)
+COMMENT_COLUMNS = ("id", "task_id", "user_id", "comment_text", "created_at", "updated_at")
+
+
+def _skewed(rng: random.Random, start: int, count: int) -> int:
+    # Squaring a uniform draw puts about a third of the picks in the first tenth of the range.
+    return start + int(count * rng.random() ** 2)
+
+
+def _timestamp(rng: random.Random, now: datetime) -> datetime:
+    return now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+
+def _users(rng: random.Random, start: int, count: int, prefix: str, hashed: str, now: datetime) -> Iterator[tuple[Any, ...]]:
+    for i in range(count):
+        role = "admin" if i % 100 == 0 else "manager" if i % 5 == 1 else "user"
+        created = _timestamp(rng, now)
+        yield (start + i, f"{prefix}-{i}@bench.test", hashed, f"Load User {i}", role, True, created, created)
+
+
+def _projects(rng: random.Random, start: int, count: int, managers: list[int], now: datetime) -> Iterator[tuple[Any, ...]]:
+    statuses = rng.choices(("active", "completed", "archived"), weights=(80, 15, 5), k=count)
+    for i in range(count):
+        created = _timestamp(rng, now)
+        yield (start + i, f"Project {start + i}", f"Synthetic project {start + i}", rng.choice(managers), statuses[i], created, created)
+
+
+def _tasks(rng: random.Random, start: int, count: int, projects: tuple[int, int], users: tuple[int, int], now: datetime) -> Iterator[tuple[Any, ...]]:
+    for i in range(count):
+        created = _timestamp(rng, now)
+        assignee = rng.randrange(users[0], users[0] + users[1]) if rng.random() < 0.7 else None
+        due = now + timedelta(days=rng.randint(-60, 60)) if rng.random() < 0.6 else None
+        yield (
+            start + i,
+            f"Task {start + i}",
+            f"Synthetic task {start + i} with a short description to search and serialize",
+            _skewed(rng, *projects),
+            assignee,
+            rng.choices(("todo", "in_progress", "done"), weights=(50, 20, 30))[0],
+            rng.choices(("low", "medium", "high"), weights=(30, 50, 20))[0],
+            due,
+            created,
+            created,
+        )
+
+
+def _comments(rng: random.Random, start: int, count: int, tasks: tuple[int, int], users: tuple[int, int], now: datetime) -> Iterator[tuple[Any, ...]]:
+    for i in range(count):
+        created = _timestamp(rng, now)
+        yield (start + i, _skewed(rng, *tasks), rng.randrange(users[0], users[0] + users[1]), f"Synthetic comment {start + i}", created, created)
+
+
+async def _next_id(db: Any, model: Any) -> int:
+    from sqlalchemy import func, select
+
+    return ((await db.scalar(select(func.max(model.id)))) or 0) + 1
+
+
+async def _load(db: Any, model: Any, columns: tuple[str, ...], rows: Iterator[tuple[Any, ...]], batch_size: int) -> dict[str, Any]:
+    from sqlalchemy import insert, text
+
+    postgresql = db.bind.dialect.name == "postgresql"
+    count = 0
+    started = time.perf_counter()
+    while batch := list(islice(rows, batch_size)):
+        if postgresql:
+            connection = await db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(model.__tablename__, records=batch, columns=columns)
+        else:
+            await db.execute(insert(model), [dict(zip(columns, row)) for row in batch])
+        await db.commit()
+        count += len(batch)
+    if postgresql and count:
+        # Explicit ids leave the serial sequence behind; move it past them so the API's inserts don't collide.
+        table = model.__tablename__
+        await db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"))
+        await db.execute(text(f"ANALYZE {table}"))
+        await db.commit()
+    elapsed = time.perf_counter() - started
+    return {"rows": count, "seconds": round(elapsed, 3), "rows_per_second": round(count / elapsed) if elapsed else None}
+
+
+async def seed(users: int, projects: int, tasks: int, comments: int, prefix: str = "load", batch_size: int = 10_000, seed_value: int = 1) -> dict[str, Any]:
+    from app.core.security import get_password_hash
+    from app.db.models.project import Project
+    from app.db.models.task import Task
+    from app.db.models.task_comment import TaskComment
+    from app.db.models.user import User
+    from app.db.session import async_session
+
+    if users < 1 or (projects and users < 2):
+        raise ValueError("Need at least one user, and two so that one is a manager when seeding projects")
+    rng = random.Random(seed_value)
+    now = datetime.now().replace(microsecond=0)
+    # One bcrypt hash for every account: hashing each of 10k passwords would dominate the load time.
+    hashed = get_password_hash(PASSWORD)
+    result: dict[str, Any] = {}
+    async with async_session() as db:
+        user_start = await _next_id(db, User)
+        result["users"] = await _load(db, User, USER_COLUMNS, _users(rng, user_start, users, prefix, hashed, now), batch_size)
+        managers = [user_start + i for i in range(users) if i % 5 == 1]
+
+        project_start = await _next_id(db, Project)
+        result["projects"] = await _load(db, Project, PROJECT_COLUMNS, _projects(rng, project_start, projects, managers, now), batch_size)
+
+        task_start = await _next_id(db, Task)
+        if tasks and not projects:
+            raise ValueError("Tasks need projects to belong to")
+        result["tasks"] = await _load(
+            db, Task, TASK_COLUMNS, _tasks(rng, task_start, tasks, (project_start, projects), (user_start, users), now), batch_size
+        )
+
+        comment_start = await _next_id(db, TaskComment)
+        if comments and not tasks:
+            raise ValueError("Comments need tasks to belong to")
+        result["comments"] = await _load(
+            db, TaskComment, COMMENT_COLUMNS, _comments(rng, comment_start, comments, (task_start, tasks), (user_start, users), now), batch_size
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--comments", type=int, default=2_000_000)
+    parser.add_argument("--prefix", default="load", help="email prefix; use a new one to seed a second dataset")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (e.g. for a scratch SQLite database)")
+    args = parser.parse_args()
+
+    async def run() -> dict[str, Any]:
+        if args.create_schema:
+            await create_schema()
+        return await seed(args.users, args.projects, args.tasks, args.comments, args.prefix, args.batch_size, args.seed)
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Production server: `gunicorn main:app` picks this file up from the working directory.
+# Every setting can be overridden on the command line or through the environment variables below.
+import logging
+import os
+import tempfile
+import time
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# One worker per core available to this process (cpuset-aware, unlike os.cpu_count()).
+workers = int(os.getenv("WEB_CONCURRENCY", len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# A scrape reaches one worker; workers share their metrics through this directory so /metrics covers them all.
+os.environ.setdefault("METRICS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="task-api-metrics-"))
+
+# Import the app once in the master and fork it, instead of importing it again in every worker.
+preload_app = True
+
+# Recycle a worker after this many requests (spread by the jitter so they don't all restart together).
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", str(max_requests // 10)))
+
+# On SIGTERM workers stop accepting, finish in-flight requests for up to this long, then exit.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+
+def on_starting(server):
+    from app.core.config import settings
+
+    # State that each worker would keep on its own must be shared once there is more than one worker.
+    problems = settings.per_worker_state() if server.cfg.workers > 1 else []
+    if problems:
+        raise SystemExit(f"Refusing to start {server.cfg.workers} workers: " + "; ".join(problems))
+
+
+def post_fork(server, worker):
+    from app.db.session import engine, replica_router
+
+    os.environ["WORKER_STARTED_AT"] = str(time.time())
+    # Engines are created when the master imports the app but never connect there. Dropping the pools
+    # anyway guarantees a worker opens its own connections instead of sharing a socket with its siblings.
+    for e in (engine, *(replica.engine for replica in replica_router.replicas)):
+        e.sync_engine.dispose(close=False)
+    # Send the app's own log records (worker readiness, query warnings) to gunicorn's error log.
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = server.log.error_log.handlers
+    app_logger.setLevel(server.log.error_log.level)
+    app_logger.propagate = False
+
+
+def child_exit(server, worker):
+    # A worker killed before its shutdown ran leaves its metrics file behind.
+    try:
+        os.remove(os.path.join(os.environ["METRICS_MULTIPROC_DIR"], f"{worker.pid}.prom"))
+    except FileNotFoundError:
+        pass
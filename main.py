@@ -1,25 +1,31 @@
-from fastapi import FastAPI
-from app.api.routes import health
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
 
-load_dotenv(dotenv_path=".env")
-
-import os
-print("DEBUG: DATABASE_URL =", os.getenv("DATABASE_URL"))
+from app.core.config import settings
+from app.core.lifespan import lifespan
+from app.core.metrics import MetricsMiddleware
+from app.core.query_budget import QueryWatchMiddleware
+from app.core.rate_limit import LoadSheddingMiddleware, shedding_stats
+from app.api.dependencies import rate_limit
+from app.db.engine import pool_wait
+from app.db.session import engine
 
 from app.api.routes import (
     auth,
+    health,
     users,
     projects,
     tasks,
     comments,
+    search,
+    sync,
 )
 
 app = FastAPI(
     title="Task Management API",
     version="1.0.0",
     description="API for managing users, projects, tasks, and comments.",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -30,11 +36,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_WATCH:
+    app.add_middleware(QueryWatchMiddleware, repeat_threshold=settings.QUERY_WATCH_REPEAT_THRESHOLD)
+
+app.add_middleware(
+    LoadSheddingMiddleware,
+    max_in_flight=settings.SHED_MAX_IN_FLIGHT,
+    pool_wait=lambda: pool_wait(engine),
+    max_pool_wait=settings.SHED_POOL_WAIT_SECONDS,
+    stats=shedding_stats,
+)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING)
+
 app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(projects.router)
-app.include_router(tasks.router)
-app.include_router(comments.router)
+app.include_router(users.router, dependencies=[Depends(rate_limit)])
+app.include_router(projects.router, dependencies=[Depends(rate_limit)])
+app.include_router(tasks.router, dependencies=[Depends(rate_limit)])
+app.include_router(comments.router, dependencies=[Depends(rate_limit)])
+app.include_router(search.router, dependencies=[Depends(rate_limit)])
+app.include_router(sync.router, dependencies=[Depends(rate_limit)])
 app.include_router(health.router)
 
 @app.get("/", tags=["Health"])
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+import pytest
+
+# Settings are read when the app is imported, so these must be set first. Each test gets a fresh SQLite file.
+_DB_DIR = Path(tempfile.mkdtemp(prefix="task-api-tests-"))
+_DB_PATH = _DB_DIR / "test.db"
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{_DB_PATH}",
+    SECRET_KEY="test-secret",
+    RATE_LIMIT_ENABLED="false",
+    RESPONSE_CACHE_TTL_SECONDS="0",
+    CHANGE_FEED_URL="memory://",
+)
+
+import httpx  # noqa: E402
+
+from app.core.cache import MemoryCache  # noqa: E402
+from app.core.query_budget import ROUTE_BUDGETS, query_budget, query_log  # noqa: E402
+from app.db import base  # noqa: E402,F401  (register models on Base.metadata)
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from main import app  # noqa: E402
+
+PASSWORD = "test-password"
+
+
+class BudgetedApp:
+    # Fails the test (QueryBudgetExceeded reaches the client) when a request runs more statements than
+    # its route's entry in ROUTE_BUDGETS. A route missing from the table fails with KeyError.
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        with query_log() as log:
+            await self.app(scope, receive, send)
+        route = scope.get("route")
+        if route is None:
+            return
+        endpoint = (scope["method"], route.path)
+        budget = ROUTE_BUDGETS[endpoint]
+        if budget is not None:
+            query_budget(budget).check(log, " ".join(endpoint))
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def client(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[httpx.AsyncClient]:
+    await engine.dispose()
+    _DB_PATH.unlink(missing_ok=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # Ids restart with every database, so cached principals and write marks from an earlier test must not survive.
+    monkeypatch.setattr("app.core.principal.principal_cache", MemoryCache())
+    monkeypatch.setattr("app.db.session.recent_writes", MemoryCache())
+    transport = httpx.ASGITransport(app=BudgetedApp(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    await engine.dispose()
+
+
+async def register(client: httpx.AsyncClient, email: str, role: str = "user") -> dict[str, str]:
+    response = await client.post("/auth/register", json={"email": email, "password": PASSWORD, "full_name": email.split("@")[0], "role": role})
+    assert response.status_code == 200, response.text
+    response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+async def admin(client: httpx.AsyncClient) -> dict[str, str]:
+    return await register(client, "admin@example.com", "admin")
+
+
+async def count_statements(request: Awaitable[httpx.Response]) -> tuple[int, httpx.Response]:
+    with query_log() as log:
+        response = await request
+    return len(log), response
+
+
+@asynccontextmanager
+async def open_stream(path: str, headers: dict[str, str]) -> AsyncIterator[asyncio.Queue]:
+    # Calls the app directly and hands back the ASGI messages it sends as they come: httpx's ASGITransport
+    # buffers the whole body, which never ends for an event stream. The client disconnects on exit.
+    messages: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+
+    async def receive() -> dict:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, messages.put))
+    try:
+        yield messages
+    finally:
+        disconnected.set()
+        await asyncio.wait_for(task, 5)
@@ -0,0 +1,49 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.events import change_feed
+
+pytestmark = pytest.mark.anyio
+
+
+async def _project_with_task(client: httpx.AsyncClient, headers: dict[str, str]) -> tuple[int, int]:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=headers)
+    task = await client.post(f"/projects/{project.json()['id']}/tasks/", json={"title": "t", "description": "d"}, headers=headers)
+    return project.json()["id"], task.json()["id"]
+
+
+@pytest.mark.parametrize("field", ["status", "priority"])
+async def test_null_status_or_priority_is_rejected(client: httpx.AsyncClient, admin: dict[str, str], field: str) -> None:
+    project_id, task_id = await _project_with_task(client, admin)
+    response = await client.patch(f"/projects/{project_id}/tasks/bulk", json={"ids": [task_id], "changes": {field: None}}, headers=admin)
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("task_filter", [{}, {"status": [], "assigned_to": None}])
+async def test_empty_filter_is_rejected(client: httpx.AsyncClient, admin: dict[str, str], task_filter: dict) -> None:
+    project_id, _ = await _project_with_task(client, admin)
+    response = await client.patch(f"/projects/{project_id}/tasks/bulk", json={"filter": task_filter, "changes": {"status": "done"}}, headers=admin)
+    assert response.status_code == 422
+
+
+async def test_null_assignee_unassigns(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project_id, task_id = await _project_with_task(client, admin)
+    await client.put(f"/projects/{project_id}/tasks/{task_id}/assign", params={"user_id": 1}, headers=admin)
+
+    response = await client.patch(f"/projects/{project_id}/tasks/bulk", json={"ids": [task_id], "changes": {"assigned_to": None}}, headers=admin)
+    assert response.status_code == 200
+    assert response.json()["updated"] == [task_id]
+    task = await client.get(f"/projects/{project_id}/tasks/{task_id}", headers=admin)
+    assert task.json()["assigned_to"] is None
+
+
+async def test_bulk_create_publishes_one_event(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project_id, _ = await _project_with_task(client, admin)
+    async with change_feed.subscribe(project_id) as subscription:
+        response = await client.post(f"/projects/{project_id}/tasks/bulk", json=[{"title": f"t{i}", "description": "d"} for i in range(3)], headers=admin)
+        assert response.status_code == 201
+        assert subscription.queue.qsize() == 1
+        event = json.loads(subscription.queue.get_nowait())
+    assert event == {"type": "tasks.created", "data": {"ids": [task["id"] for task in response.json()["created"]]}}
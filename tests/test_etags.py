@@ -0,0 +1,32 @@
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _conditional_updates(client: httpx.AsyncClient, url: str, headers: dict[str, str], first: dict, second: dict) -> None:
+    etag = (await client.get(url, headers=headers)).headers["ETag"]
+
+    response = await client.put(url, json=first, headers={**headers, "If-Match": etag})
+    assert response.status_code == 200, response.text
+    # Versions have sub-second precision, so a write in the same second still gets a new ETag.
+    assert response.headers["ETag"] != etag
+
+    response = await client.put(url, json=second, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+
+
+async def test_task_if_match(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=admin)
+    task = await client.post(f"/projects/{project.json()['id']}/tasks/", json={"title": "t", "description": "d"}, headers=admin)
+    url = f"/projects/{project.json()['id']}/tasks/{task.json()['id']}"
+    await _conditional_updates(client, url, admin, {"status": "in_progress"}, {"status": "done"})
+
+
+async def test_project_if_match(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=admin)
+    await _conditional_updates(client, f"/projects/{project.json()['id']}", admin, {"name": "Q"}, {"name": "R"})
+
+
+async def test_profile_if_match(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    await _conditional_updates(client, "/users/me", admin, {"full_name": "Q"}, {"full_name": "R"})
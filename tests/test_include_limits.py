@@ -0,0 +1,41 @@
+import httpx
+import pytest
+
+from app.crud.expand import INCLUDE_LIMITS
+from app.db.models.project import Project
+from app.db.models.task import Task
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def small_limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(INCLUDE_LIMITS, (Project, "tasks"), 2)
+    monkeypatch.setitem(INCLUDE_LIMITS, (Task, "comments"), 2)
+
+
+async def test_included_children_are_capped(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    full = await client.post("/projects/", json={"name": "Full", "description": "d"}, headers=admin)
+    small = await client.post("/projects/", json={"name": "Small", "description": "d"}, headers=admin)
+    full_id, small_id = full.json()["id"], small.json()["id"]
+    tasks = await client.post(f"/projects/{full_id}/tasks/bulk", json=[{"title": f"t{i}", "description": "d"} for i in range(3)], headers=admin)
+    task_ids = [task["id"] for task in tasks.json()["created"]]
+    await client.post(f"/projects/{small_id}/tasks/", json={"title": "t", "description": "d"}, headers=admin)
+    for i in range(3):
+        await client.post(f"/tasks/{task_ids[0]}/comments/", json={"comment_text": f"c{i}"}, headers=admin)
+
+    page = await client.get("/projects/", params={"include": "tasks.comments.user"}, headers=admin)
+    assert page.status_code == 200
+    projects = {p["id"]: p for p in page.json()["items"]}
+    assert [t["id"] for t in projects[full_id]["tasks"]] == task_ids[:2]
+    assert projects[full_id]["tasks_truncated"] is True
+    assert len(projects[small_id]["tasks"]) == 1
+    assert "tasks_truncated" not in projects[small_id]
+    first = projects[full_id]["tasks"][0]
+    assert len(first["comments"]) == 2 and first["comments_truncated"] is True
+    assert first["comments"][0]["user"]["email"] == "admin@example.com"
+
+    task = await client.get(f"/projects/{full_id}/tasks/{task_ids[0]}", params={"include": "comments"}, headers=admin)
+    assert len(task.json()["comments"]) == 2 and task.json()["comments_truncated"] is True
+    project = await client.get(f"/projects/{full_id}", params={"include": "tasks"}, headers=admin)
+    assert len(project.json()["tasks"]) == 2 and project.json()["tasks_truncated"] is True
@@ -0,0 +1,62 @@
+import os
+import re
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.core.metrics import WorkerSnapshots, metrics, with_labels
+
+pytestmark = pytest.mark.anyio
+
+
+def sample(body: str, name: str, **labels: str) -> float:
+    pairs = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{re.escape(name)}{re.escape('{' + pairs + '}') if pairs else ''} (\S+)$", body, re.M)
+    assert match, f"{name} {labels} missing from /metrics"
+    return float(match.group(1))
+
+
+async def test_cache_feed_and_shedding_counters(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    before = (await client.get("/metrics")).text
+    await client.get("/users/me", headers=admin)
+    await client.get("/users/me", headers=admin)
+    after = (await client.get("/metrics")).text
+
+    assert sample(after, "cache_lookups_total", cache="principal", result="hits") > sample(before, "cache_lookups_total", cache="principal", result="hits")
+    for outcome in ("published", "delivered", "dropped", "overflowed"):
+        sample(after, "change_feed_events_total", outcome=outcome)
+    sample(after, "cache_lookups_total", cache="response", result="coalesced")
+    sample(after, "requests_shed_total", reason="pool_wait")
+    assert sample(after, "requests_in_flight") >= 0
+
+
+async def test_pool_gauges(client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    # SQLite's pool isn't instrumented, so stand in the stats of a PostgreSQL pool.
+    stats = {
+        "pool": "InstrumentedAsyncPool", "size": 10, "max_overflow": 20, "checked_out": 3, "checked_in": 7, "overflow": 0,
+        "saturation": 0.1, "checkouts": 42, "checkout_timeouts": 1, "checkout_wait_seconds_total": 0.5,
+        "checkout_wait_seconds_max": 0.2, "checkout_wait_seconds_avg": 0.01, "checkout_wait_seconds_recent": 0.003,
+    }
+    monkeypatch.setattr("app.api.routes.health.pool_stats", lambda engine: stats)
+    body = (await client.get("/metrics")).text
+    assert sample(body, "db_pool_connections", pool="primary", state="checked_out") == 3
+    assert sample(body, "db_pool_capacity", pool="primary") == 30
+    assert sample(body, "db_pool_saturation", pool="primary") == 0.1
+    assert sample(body, "db_pool_checkout_timeouts_total", pool="primary") == 1
+    assert sample(body, "db_pool_checkout_wait_seconds_recent", pool="primary") == 0.003
+
+
+async def test_metrics_cover_every_worker(client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    snapshots = WorkerSnapshots(str(tmp_path), interval=5)
+    monkeypatch.setattr("app.core.metrics.snapshots", snapshots)
+    (tmp_path / "99999.prom").write_text(with_labels(metrics.render(), worker="99999"))
+    (tmp_path / "99998.prom").write_text(with_labels(metrics.render(), worker="99998"))
+    os.utime(tmp_path / "99998.prom", (0, 0))  # a worker that stopped writing long ago
+
+    body = (await client.get("/metrics")).text
+    assert body.count("# TYPE requests_in_flight gauge") == 1
+    assert sample(body, "requests_in_flight", worker=str(os.getpid())) >= 0
+    assert sample(body, "requests_in_flight", worker="99999") >= 0
+    assert 'worker="99998"' not in body
+    assert (tmp_path / f"{os.getpid()}.prom").exists()
@@ -0,0 +1,18 @@
+import httpx
+import pytest
+
+pytestmark = [pytest.mark.anyio, pytest.mark.filterwarnings("error")]
+
+
+async def test_summary_serializes_without_warnings(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=admin)
+    project_id = project.json()["id"]
+    await client.post(f"/projects/{project_id}/tasks/", json={"title": "t", "description": "d", "priority": "high"}, headers=admin)
+
+    for params in ({"include_summary": True}, {"include_summary": True, "include": "owner"}):
+        response = await client.get(f"/projects/{project_id}", params=params, headers=admin)
+        assert response.status_code == 200
+        assert response.json()["summary"]["tasks_by_priority"]["high"] == 1
+    response = await client.get("/projects/", params={"include_summary": True}, headers=admin)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["summary"]["total_tasks"] == 1
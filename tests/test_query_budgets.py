@@ -0,0 +1,62 @@
+import httpx
+import pytest
+from fastapi.routing import APIRoute
+
+from app.core.query_budget import ROUTE_BUDGETS
+from main import app
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+def api_routes(routes: list) -> list[APIRoute]:
+    found = []
+    for route in routes:
+        if isinstance(route, APIRoute):
+            found.append(route)
+        elif hasattr(route, "original_router"):
+            found.extend(api_routes(route.original_router.routes))
+    return found
+
+
+def test_every_route_has_a_budget() -> None:
+    endpoints = {(method, route.path) for route in api_routes(app.routes) for method in route.methods}
+    assert endpoints - ROUTE_BUDGETS.keys() == set()
+    assert ROUTE_BUDGETS.keys() - endpoints == set()
+
+
+async def test_routes_stay_within_budget(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    # The client fixture enforces ROUTE_BUDGETS on every call; this walks each route through its
+    # widest path. The event stream never ends, so it is left out.
+    user = await register(client, "user@example.com")
+    calls = [
+        ("GET", "/", {}),
+        ("GET", "/healthz/public", {}),
+        ("GET", "/healthz", {"headers": admin}),
+        ("GET", "/healthz/pool", {"headers": admin}),
+        ("GET", "/metrics", {}),
+        ("GET", "/users/me", {"headers": user}),
+        ("PUT", "/users/me", {"headers": user, "json": {"full_name": "Renamed"}}),
+        ("POST", "/projects/", {"headers": admin, "json": {"name": "P", "description": "d"}}),
+        ("POST", "/projects/1/tasks/", {"headers": admin, "json": {"title": "t", "description": "d"}}),
+        ("POST", "/projects/1/tasks/bulk", {"headers": admin, "json": [{"title": f"b{i}", "description": "d"} for i in range(3)]}),
+        ("POST", "/projects/1/tasks/import", {"headers": admin, "content": b'{"title": "i", "description": "d"}\n'}),
+        ("PATCH", "/projects/1/tasks/bulk", {"headers": admin, "json": {"ids": [2, 3], "changes": {"status": "done"}}}),
+        ("PUT", "/projects/1/tasks/1/assign", {"headers": admin, "params": {"user_id": 2}}),
+        ("POST", "/tasks/1/comments/", {"headers": admin, "json": {"comment_text": "hello"}}),
+        ("PUT", "/projects/1/tasks/1", {"headers": admin, "json": {"status": "done"}}),
+        ("GET", "/projects/", {"headers": admin, "params": {"include_summary": True, "include": "owner,tasks.comments.user,tasks.assignee"}}),
+        ("GET", "/projects/1", {"headers": admin, "params": {"include_summary": True, "include": "owner,tasks.comments.user,tasks.assignee"}}),
+        ("GET", "/projects/1/summary", {"headers": admin}),
+        ("GET", "/projects/1/export", {"headers": admin}),
+        ("GET", "/projects/1/tasks/", {"headers": admin, "params": {"include": "assignee,comments.user"}}),
+        ("GET", "/projects/1/tasks/1", {"headers": admin, "params": {"include": "assignee,comments.user"}}),
+        ("GET", "/tasks/1/comments/", {"headers": admin}),
+        ("GET", "/search/", {"headers": admin, "params": {"q": "hello"}}),
+        ("GET", "/sync/", {"headers": admin}),
+        ("DELETE", "/projects/1/tasks/2", {"headers": admin}),
+        ("DELETE", "/projects/1", {"headers": admin}),
+    ]
+    for method, url, kwargs in calls:
+        response = await client.request(method, url, **kwargs)
+        assert response.status_code < 400, f"{method} {url}: {response.status_code} {response.text}"
@@ -0,0 +1,27 @@
+import httpx
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from app.db.session import wrote_recently
+from main import app
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_write_window_opens_before_the_response(client: httpx.AsyncClient) -> None:
+    headers = await register(client, "writer@example.com")
+    user_id = (await client.get("/users/me", headers=headers)).json()["id"]
+    seen: list[bool] = []
+
+    async def recording_app(scope: Scope, receive: Receive, send: Send) -> None:
+        async def record(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                seen.append(await wrote_recently(user_id))
+            await send(message)
+        await app(scope, receive, record)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=recording_app), base_url="http://test") as recording:
+        response = await recording.put("/users/me", json={"full_name": "Renamed"}, headers=headers)
+    assert response.status_code == 200
+    assert seen == [True]
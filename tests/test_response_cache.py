@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import MemoryCache
+from app.core.response_cache import ResponseCache
+from app.db.session import async_session, engine, is_primary
+
+pytestmark = pytest.mark.anyio
+
+
+async def _load() -> bytes:
+    return b"body"
+
+
+async def test_replica_reads_are_not_cached() -> None:
+    cache = ResponseCache(MemoryCache(), None, ttl=30)
+    assert await cache.load("replica", _load, store=False) == b"body"
+    assert await cache.get("replica") is None
+    assert await cache.load("primary", _load) == b"body"
+    assert await cache.get("primary") == b"body"
+
+
+async def test_only_primary_sessions_are_primary() -> None:
+    async with async_session() as primary, AsyncSession(bind=engine) as replica:
+        assert is_primary(primary)
+        assert not is_primary(replica)
@@ -0,0 +1,21 @@
+from app.core.config import Settings
+
+
+def _settings(**values: object) -> Settings:
+    return Settings(_env_file=None, DATABASE_URL="sqlite+aiosqlite://", SECRET_KEY="s", **{"RESPONSE_CACHE_TTL_SECONDS": None, **values})
+
+
+def test_response_cache_is_off_without_a_shared_store() -> None:
+    assert _settings().response_cache_ttl == 0
+    assert _settings(RESPONSE_CACHE_URL="redis://cache:6379/0").response_cache_ttl == 30
+    assert _settings().per_worker_state() == []
+
+
+def test_per_worker_response_cache_is_reported() -> None:
+    assert _settings(RESPONSE_CACHE_TTL_SECONDS=30).per_worker_state()
+    assert _settings(RESPONSE_CACHE_TTL_SECONDS=30, RESPONSE_CACHE_URL="redis://cache:6379/0").per_worker_state() == []
+
+
+def test_per_worker_read_your_writes_is_reported() -> None:
+    assert _settings(DATABASE_REPLICA_URLS="postgresql+asyncpg://replica/db").per_worker_state()
+    assert _settings(DATABASE_REPLICA_URLS="postgresql+asyncpg://replica/db", READ_YOUR_WRITES_CACHE_URL="redis://cache:6379/0").per_worker_state() == []
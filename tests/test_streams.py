@@ -0,0 +1,37 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.events import change_feed
+from app.db.session import engine
+from tests.conftest import open_stream
+
+pytestmark = pytest.mark.anyio
+
+
+async def _next(messages: asyncio.Queue) -> dict:
+    return await asyncio.wait_for(messages.get(), 5)
+
+
+async def test_event_stream_holds_no_connection(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=admin)
+    project_id = project.json()["id"]
+    async with open_stream(f"/projects/{project_id}/events", admin) as messages:
+        assert (await _next(messages))["status"] == 200
+        change_feed.publish(project_id, {"type": "ping"})
+        while not (await _next(messages)).get("body"):
+            pass
+        assert engine.pool.checkedout() == 0
+
+
+async def test_export_holds_only_its_own_connection(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=admin)
+    project_id = project.json()["id"]
+    await client.post(f"/projects/{project_id}/tasks/bulk", json=[{"title": f"t{i}", "description": "d"} for i in range(3)], headers=admin)
+    async with open_stream(f"/projects/{project_id}/export", admin) as messages:
+        assert (await _next(messages))["status"] == 200
+        body = (await _next(messages))["body"]
+        assert body
+        # The export's own read session; the request's sessions are already closed.
+        assert engine.pool.checkedout() == 1
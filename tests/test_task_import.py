@@ -0,0 +1,48 @@
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from app.crud.task_import import MAX_LINE_BYTES, iter_lines
+
+pytestmark = pytest.mark.anyio
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _import(client: httpx.AsyncClient, headers: dict[str, str], body: bytes, import_format: str = "ndjson") -> dict:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=headers)
+    response = await client.post(f"/projects/{project.json()['id']}/tasks/import", params={"format": import_format}, content=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_lines_split_across_chunks() -> None:
+    # BOM and a two-byte character each cut in half by the chunking.
+    lines = [line async for line in iter_lines(_chunks(b"\xef\xbb", b"\xbfa\n\xc3", b"\xa9\nb"))]
+    assert lines == ["a", "é", "b"]
+
+
+async def test_invalid_utf8_is_a_row_error(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    body = b'{"title": "ok", "description": "d"}\n\xff\xfe\n{"title": "also ok", "description": "d"}\n'
+    result = await _import(client, admin, body)
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert result["errors"][0]["index"] == 1
+    assert "UTF-8" in result["errors"][0]["errors"][0]["msg"]
+
+
+async def test_overlong_line_is_a_row_error(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    body = b"x" * (MAX_LINE_BYTES + 1) + b'\n{"title": "ok", "description": "d"}\n'
+    result = await _import(client, admin, body)
+    assert (result["created"], result["failed"]) == (1, 1)
+    assert "longer than" in result["errors"][0]["errors"][0]["msg"]
+
+
+async def test_unbalanced_csv_quote_is_bounded(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    body = b'title,description\n"open,d\n' + b"filler line\n" * (MAX_LINE_BYTES // 12 + 1) + b"ok,d\n"
+    result = await _import(client, admin, body, "csv")
+    assert result["errors"][0]["index"] == 0
+    assert "longer than" in result["errors"][0]["errors"][0]["msg"]
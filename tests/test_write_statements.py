@@ -0,0 +1,73 @@
+import httpx
+import pytest
+
+from tests.conftest import count_statements, register
+
+pytestmark = pytest.mark.anyio
+
+# Each write is one INSERT/UPDATE/DELETE ... RETURNING; the other allowed statement is the principal
+# lookup of a cold cache, which the first call of each test pays.
+MAX_WRITE_STATEMENTS = 2
+
+
+async def _project_and_task(client: httpx.AsyncClient, headers: dict[str, str]) -> tuple[int, int]:
+    project = await client.post("/projects/", json={"name": "P", "description": "d"}, headers=headers)
+    task = await client.post(f"/projects/{project.json()['id']}/tasks/", json={"title": "t", "description": "d"}, headers=headers)
+    return project.json()["id"], task.json()["id"]
+
+
+async def test_register_and_profile_update(client: httpx.AsyncClient) -> None:
+    count, response = await count_statements(
+        client.post("/auth/register", json={"email": "new@example.com", "password": "pw-123456", "full_name": "New"})
+    )
+    assert response.status_code == 200
+    assert count <= MAX_WRITE_STATEMENTS
+
+    headers = await register(client, "me@example.com")
+    count, response = await count_statements(client.put("/users/me", json={"full_name": "Renamed"}, headers=headers))
+    assert response.status_code == 200
+    assert count <= MAX_WRITE_STATEMENTS
+
+
+async def test_project_writes(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    count, response = await count_statements(client.post("/projects/", json={"name": "P", "description": "d"}, headers=admin))
+    assert response.status_code == 201
+    assert count <= MAX_WRITE_STATEMENTS
+    project_id = response.json()["id"]
+
+    count, response = await count_statements(client.put(f"/projects/{project_id}", json={"name": "Q"}, headers=admin))
+    assert response.status_code == 200
+    assert count <= MAX_WRITE_STATEMENTS
+
+    count, response = await count_statements(client.delete(f"/projects/{project_id}", headers=admin))
+    assert response.status_code == 204
+    assert count <= MAX_WRITE_STATEMENTS
+
+
+async def test_task_writes(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    project_id, _ = await _project_and_task(client, admin)
+
+    count, response = await count_statements(client.post(f"/projects/{project_id}/tasks/", json={"title": "t", "description": "d"}, headers=admin))
+    assert response.status_code == 201
+    assert count <= MAX_WRITE_STATEMENTS
+    task_id = response.json()["id"]
+
+    count, response = await count_statements(client.put(f"/projects/{project_id}/tasks/{task_id}", json={"status": "done"}, headers=admin))
+    assert response.status_code == 200
+    assert count <= MAX_WRITE_STATEMENTS
+
+    count, response = await count_statements(client.put(f"/projects/{project_id}/tasks/{task_id}/assign", params={"user_id": 1}, headers=admin))
+    assert response.status_code == 200
+    assert count <= MAX_WRITE_STATEMENTS
+
+    count, response = await count_statements(client.delete(f"/projects/{project_id}/tasks/{task_id}", headers=admin))
+    assert response.status_code == 204
+    assert count <= MAX_WRITE_STATEMENTS
+
+
+async def test_comment_write(client: httpx.AsyncClient, admin: dict[str, str]) -> None:
+    _, task_id = await _project_and_task(client, admin)
+
+    count, response = await count_statements(client.post(f"/tasks/{task_id}/comments/", json={"comment_text": "hello"}, headers=admin))
+    assert response.status_code == 201
+    assert count <= MAX_WRITE_STATEMENTS